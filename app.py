@@ -16,7 +16,7 @@ from tfln_components import (
     TFLNMachZehnderModulator, TFLNRingModulator, TFLNPhotonicLink,
     TFLNWaferType, ModulationFormat
 )
-from tfln_plots import generate_tfln_plots
+from tfln_plots import generate_tfln_plots, IMAGE_FORMATS
 from gerber_viewer import generate_all_layers
 
 app = Flask(__name__)
@@ -85,6 +85,8 @@ def matrix_multiply():
     """Execute matrix multiplication"""
     data = request.json
     size = data.get('size', 128)
+    if not isinstance(size, int) or size < matrix_multiplier.size:
+        return jsonify({'error': f'size must be an integer >= {matrix_multiplier.size}'}), 400
     
     # Create random test vector
     vector = np.random.randn(size) + 1j * np.random.randn(size)
@@ -349,7 +351,12 @@ def tfln_pam4_encode():
 @app.route('/api/tfln/plots')
 def get_tfln_plots():
     """Generate and return all TFLN characterization plots"""
-    plots = generate_tfln_plots()
+    # PNG unless the client opts in with ?format=webp or ?format=svg
+    image_format = request.args.get('format', 'png')
+    if image_format not in IMAGE_FORMATS:
+        return jsonify({'error': f'Unsupported format: {image_format}'}), 400
+    # Rendered in this process; a worker pool would re-import the whole app
+    plots = generate_tfln_plots(max_workers=1, image_format=image_format)
     return jsonify(plots)
 
 @app.route('/api/tfln/comparison')
@@ -0,0 +1,11 @@
+"""
+TFLN Plot Static Assets
+Render the fixed-data plots (tfln_plots.STATIC_PLOTS) once at build time
+"""
+
+from tfln_plots import build_static_assets
+
+
+if __name__ == "__main__":
+    for path in build_static_assets():
+        print(f"  ✓ Generated: {path}")
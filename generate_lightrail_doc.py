@@ -11,6 +11,16 @@ import numpy as np
 import matplotlib.pyplot as plt
 from io import BytesIO
 import os
+import hashlib
+from generate_report import is_up_to_date, write_signature
+
+OUTPUT_PATH = '/Users/cartik_sharma/Downloads/neuromorph-main-n/photonic_computing/LightRail_AI_Enhanced_Report.docx'
+
+
+def _source_signature():
+    """Hash of this module's source; all document text and plot data live here"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
 
 
 def generate_performance_plots():
@@ -216,6 +226,12 @@ def generate_performance_plots():
 def create_enhanced_document():
     """Create enhanced TFLN document with plots and detailed specifications"""
     
+    output_path = OUTPUT_PATH
+    sig = _source_signature()
+    if is_up_to_date(output_path, sig):
+        print(f"Enhanced document up to date: {output_path}")
+        return output_path
+    
     print("Generating performance plots...")
     plots = generate_performance_plots()
     
@@ -778,8 +794,8 @@ def create_enhanced_document():
     )
     
     # Save document
-    output_path = '/Users/cartik_sharma/Downloads/neuromorph-main-n/photonic_computing/LightRail_AI_Enhanced_Report.docx'
     doc.save(output_path)
+    write_signature(output_path, sig)
     
     print(f"\nEnhanced document saved: {output_path}")
     return output_path
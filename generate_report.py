@@ -4,6 +4,22 @@ Generates comprehensive LaTeX report with finite math derivations
 """
 
 import os
+import hashlib
+
+
+def is_up_to_date(output_path, sig):
+    """Return True if output_path exists and was built from content with this signature"""
+    sig_path = output_path + '.sig'
+    if not (os.path.exists(output_path) and os.path.exists(sig_path)):
+        return False
+    with open(sig_path, 'r') as f:
+        return f.read().strip() == sig
+
+
+def write_signature(output_path, sig):
+    """Record the signature output_path was built from, next to it"""
+    with open(output_path + '.sig', 'w') as f:
+        f.write(sig)
 
 
 def generate_photonic_computing_report():
@@ -498,8 +514,15 @@ Xilinx, ``Versal ACAP Architecture Manual,'' 2021.
     # Write to file
     output_path = "/Users/cartik_sharma/Downloads/neuromorph-main-n/photonic_computing/Photonic_Computing_Technical_Report.tex"
     
+    # Skip rewrite when the existing report was built from identical content
+    sig = hashlib.blake2b(latex_content.encode('utf-8'), digest_size=16).hexdigest()
+    if is_up_to_date(output_path, sig):
+        print(f"LaTeX report up to date: {output_path}")
+        return output_path
+    
     with open(output_path, 'w') as f:
         f.write(latex_content)
+    write_signature(output_path, sig)
     
     print(f"LaTeX report generated: {output_path}")
     
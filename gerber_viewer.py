@@ -4,19 +4,20 @@ Parses and visualizes Gerber files for TFLN photonic modulator PCB
 """
 
 import re
+import sys
 import numpy as np
 from dataclasses import dataclass
 from typing import List, Tuple, Dict
 import json
 
-@dataclass
+@dataclass(slots=True)
 class GerberAperture:
     """Represents a Gerber aperture definition"""
     code: int
     shape: str  # 'C' for circle, 'R' for rectangle
     size: List[float]  # [diameter] for circle, [width, height] for rectangle
 
-@dataclass
+@dataclass(slots=True)
 class GerberElement:
     """Represents a drawing element"""
     element_type: str  # 'line', 'flash', 'arc'
@@ -249,4 +250,5 @@ def generate_all_layers(gerber_dir: str = 'gerber_files') -> Dict:
 if __name__ == '__main__':
     # Test the parser
     data = generate_all_layers()
-    print(json.dumps(data, indent=2))
+    json.dump(data, sys.stdout, indent=2)
+    sys.stdout.write('\n')
@@ -1,18 +1,108 @@
 #!/usr/bin/env python3
 import os
+import re
 import json
 import base64
-import urllib.request
-import urllib.error
+import hashlib
+import mmap
+import argparse
+import asyncio
+import ssl
+import time
+import contextlib
 import glob
 import fnmatch
 from pathlib import Path
 
+import aiohttp
+
+try:
+    import certifi
+except ImportError:  # fall back to the system CA store
+    certifi = None
+
 # Configuration
 GITHUB_API_URL = "https://api.github.com"
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 
+# Built once with verification enabled; certifi's bundle covers Python
+# installs (e.g. python.org macOS builds) that ship without system CAs
+SSL_CTX = ssl.create_default_context(cafile=certifi.where() if certifi else None)
+
+# Request bodies are serialized straight to bytes; orjson is much faster
+# on the large base64 "content" strings when installed
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    _encode = json.JSONEncoder(separators=(",", ":")).encode
+    _dumps = lambda payload: _encode(payload).encode('ascii')
+
+# Rate limits (403/429) and transient gateway errors (502/503) are retried
+RETRY_STATUSES = (403, 429, 502, 503)
+TRANSIENT_STATUSES = (502, 503)
+MAX_TRIES = 5
+
+# A 502/503 or dropped connection may come after the request took effect, so
+# only these methods are resent by default; other callers opt in with retry=True.
+# PATCH is here because the only one sent (the ref update) names its target
+# commit, and PUT is not because a repeated contents PUT fails on the sha
+RETRYABLE_METHODS = ('GET', 'HEAD', 'PATCH')
+
+# What a failed request can raise once _request has given up
+REQUEST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+def _retry_delay(response, attempt, transient=True):
+    """Seconds to wait before retrying response, or None if it is not retryable"""
+    if response.status not in RETRY_STATUSES:
+        return None
+    if not transient and response.status in TRANSIENT_STATUSES:
+        return None
+    headers = response.headers
+    if headers.get('Retry-After', '').isdigit():
+        return int(headers['Retry-After'])
+    if headers.get('X-RateLimit-Remaining') == '0' and 'X-RateLimit-Reset' in headers:
+        return max(0, int(headers['X-RateLimit-Reset']) - int(time.time())) + 1
+    if response.status == 403:
+        return None  # plain permission error, not a rate limit
+    return 2 ** attempt
+
+@contextlib.asynccontextmanager
+async def _request(session, method, url, tries=MAX_TRIES, retry=None, **kwargs):
+    """
+    session.request() that sleeps out rate limits and retries transient failures
+    
+    Rate-limited requests were never processed and are always retried.
+    Gateway errors and connection failures are retried only when `retry` is
+    true, which defaults to whether the method is in RETRYABLE_METHODS.
+    """
+    if retry is None:
+        retry = method in RETRYABLE_METHODS
+    if 'json' in kwargs:
+        # Encode once up front so retries resend the same bytes
+        kwargs['data'] = _dumps(kwargs.pop('json'))
+        kwargs['headers'] = {**kwargs.get('headers', {}), "Content-Type": "application/json"}
+    for attempt in range(tries):
+        last_try = attempt == tries - 1
+        try:
+            response = await session.request(method, url, **kwargs)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if last_try or not retry:
+                raise
+            await asyncio.sleep(2 ** attempt)
+            continue
+        delay = None if last_try else _retry_delay(response, attempt, retry)
+        if delay is None:
+            try:
+                yield response
+            finally:
+                response.release()
+            return
+        response.release()
+        await asyncio.sleep(delay)
+
 def load_gitignore(root_dir):
+    """Read .gitignore and compile all patterns into a single regex"""
     gitignore_path = os.path.join(root_dir, '.gitignore')
     patterns = []
     if os.path.exists(gitignore_path):
@@ -23,164 +113,266 @@ def load_gitignore(root_dir):
                     patterns.append(line)
     # Add default ignores
     patterns.extend(['.git', '.github', '*.pyc', '__pycache__', '.DS_Store'])
-    return patterns
+    # Directory markers ('build/') and root anchors ('/out.txt') match by name
+    patterns = [p.strip('/') for p in patterns]
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns if p))
 
-def is_ignored(path, root_dir, patterns):
-    rel_path = os.path.relpath(path, root_dir)
-    name = os.path.basename(path)
+def walk_fast(root, compiled):
+    """
+    Yield paths of files under root not matched by the compiled ignore regex.
     
-    for pattern in patterns:
-        # Normalize pattern
-        if pattern.endswith('/'):
-            pattern = pattern.rstrip('/')
-            
-        if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel_path, pattern):
-            return True
-        
-        # Check directory matches
-        if os.path.isdir(path) and (fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(name + '/', pattern)):
-            return True
-            
-        # Check path segments
-        parts = rel_path.split(os.sep)
-        for part in parts:
-             if fnmatch.fnmatch(part, pattern):
-                 return True
-                 
-    return False
+    Uses os.scandir so file types come from the cached directory entries
+    (one getdents per directory, no stat per entry); ignored directories,
+    including .git, are never entered.
+    """
+    stack = [(root, '')]
+    while stack:
+        path, prefix = stack.pop()
+        with os.scandir(path) as it:
+            for entry in it:
+                rel = prefix + entry.name
+                if compiled.match(entry.name) or compiled.match(rel):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, rel + os.sep))
+                elif entry.is_file():
+                    yield entry.path
 
 def get_file_content(file_path):
+    """Return the file's contents base64-encoded, read through mmap to avoid an extra copy"""
     with open(file_path, 'rb') as f:
-        return f.read()
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''  # mmap cannot map empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.b64encode(mm)
 
-import ssl
+def git_blob_sha(file_path):
+    """Return the SHA-1 git assigns to the file's contents as a blob"""
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        h = hashlib.sha1(b"blob " + str(size).encode() + b"\0")
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        return h.hexdigest()
 
-def upload_file(token, repo, file_path, remote_path):
+async def upload_file(session, repo, file_path, remote_path):
     url = f"{GITHUB_API_URL}/repos/{repo}/contents/{remote_path}"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json",
-        "Content-Type": "application/json"
-    }
     
-    content = get_file_content(file_path)
-    encoded_content = base64.b64encode(content).decode('utf-8')
-    
-    # Create unverified SSL context to avoid certificate errors on some macOS Python installs
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-
     # Check if file exists to get SHA (for update)
     sha = None
     try:
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, context=ctx) as response:
+        async with _request(session, 'GET', url) as response:
             if response.status == 200:
-                data = json.loads(response.read().decode('utf-8'))
-                sha = data.get('sha')
+                sha = (await response.json()).get('sha')
+                if sha == git_blob_sha(file_path):
+                    print(f"≡ unchanged: {remote_path}")
+                    return True
                 print(f"  Existing file found: {remote_path} (updating)")
-    except urllib.error.HTTPError as e:
-        if e.code != 404:
-            print(f"  Error checking file {remote_path}: {e}")
-            return False
+            elif response.status != 404:
+                print(f"  Error checking file {remote_path}: HTTP {response.status}")
+                return False
+    except REQUEST_ERRORS as e:
+        print(f"  Error checking file {remote_path}: {e}")
+        return False
 
     # Prepare payload
     data = {
         "message": f"Upload {remote_path} via photonic_uploader",
-        "content": encoded_content
+        "content": get_file_content(file_path).decode('ascii')
     }
     if sha:
         data["sha"] = sha
         
     # Upload
     try:
-        req = urllib.request.Request(url, data=json.dumps(data).encode('utf-8'), headers=headers, method='PUT')
-        with urllib.request.urlopen(req, context=ctx) as response:
+        async with _request(session, 'PUT', url, json=data) as response:
             if response.status in [200, 201]:
                 print(f"✅ Uploaded: {remote_path}")
                 return True
-    except urllib.error.HTTPError as e:
-        print(f"❌ Failed to upload {remote_path}: {e}")
-        try:
-             print(e.read().decode('utf-8'))
-        except:
-            pass
-        return False
-    except Exception as e:
+            print(f"❌ Failed to upload {remote_path}: HTTP {response.status}")
+            print(await response.text())
+            return False
+    except REQUEST_ERRORS as e:
         print(f"❌ Error uploading {remote_path}: {e}")
         return False
-    return False
 
-def create_repo(token, repo_name):
+async def create_blob(session, sem, repo, file_path):
+    """Upload one file as a git blob and return its SHA"""
+    url = f"{GITHUB_API_URL}/repos/{repo}/git/blobs"
+    async with sem:
+        # Read under the semaphore so at most `workers` encoded files are held
+        # at once, and off the event loop so other uploads keep running
+        content = await asyncio.to_thread(get_file_content, file_path)
+        data = {"content": content.decode('ascii'), "encoding": "base64"}
+        # Blobs are content-addressed, so re-posting one is harmless
+        async with _request(session, 'POST', url, retry=True, json=data) as response:
+            response.raise_for_status()
+            return (await response.json())['sha']
+
+async def get_branch_head(session, repo, branch):
+    """Return (commit_sha, tree_sha) for the branch, or None if the repository is empty"""
+    async with _request(session, 'GET', f"{GITHUB_API_URL}/repos/{repo}/git/ref/heads/{branch}") as response:
+        if response.status in (404, 409):  # 409: "Git Repository is empty"
+            return None
+        response.raise_for_status()
+        commit_sha = (await response.json())['object']['sha']
+    async with _request(session, 'GET', f"{GITHUB_API_URL}/repos/{repo}/git/commits/{commit_sha}") as response:
+        response.raise_for_status()
+        return commit_sha, (await response.json())['tree']['sha']
+
+async def get_tree_shas(session, repo, tree_sha):
+    """Return {path: blob_sha} for every file in the tree"""
+    async with _request(session, 'GET', f"{GITHUB_API_URL}/repos/{repo}/git/trees/{tree_sha}",
+                        params={"recursive": "1"}) as response:
+        response.raise_for_status()
+        tree = (await response.json()).get('tree', [])
+    return {entry['path']: entry['sha'] for entry in tree if entry['type'] == 'blob'}
+
+async def get_default_branch(session, repo):
+    async with _request(session, 'GET', f"{GITHUB_API_URL}/repos/{repo}") as response:
+        response.raise_for_status()
+        return (await response.json()).get('default_branch') or 'main'
+
+async def commit_files(session, repo, pairs, workers=8):
+    """
+    Upload all (file_path, remote_path) pairs as a single commit via the Git Data API.
+    
+    Blobs are created concurrently (at most `workers` in flight), then one
+    tree, one commit and one ref update replace the per-file commits of
+    the contents API.
+    Returns the number of files committed.
+    """
+    if not pairs:
+        return 0
+    seeded = 0
+    skipped = 0
+    try:
+        branch = await get_default_branch(session, repo)
+        head = await get_branch_head(session, repo, branch)
+        if head is None:
+            # The Git Data API refuses empty repositories; seed one file through
+            # the contents API to create the branch, then batch the rest
+            first_path, first_remote = pairs[0]
+            if not await upload_file(session, repo, first_path, first_remote):
+                return 0
+            seeded = 1
+            pairs = pairs[1:]
+            if not pairs:
+                return seeded
+            head = await get_branch_head(session, repo, branch)
+            if head is None:
+                print(f"❌ Failed to commit files: branch {branch} is still empty after seeding")
+                return seeded
+        head_commit, head_tree = head
+        
+        # Skip files whose content already matches the branch head
+        remote_shas = await get_tree_shas(session, repo, head_tree)
+        unchanged = [rp for fp, rp in pairs if remote_shas.get(rp) == git_blob_sha(fp)]
+        for remote_path in unchanged:
+            print(f"≡ unchanged: {remote_path}")
+        unchanged = set(unchanged)
+        skipped = len(unchanged)
+        pairs = [(fp, rp) for fp, rp in pairs if rp not in unchanged]
+        if not pairs:
+            return seeded + skipped
+        
+        sem = asyncio.Semaphore(max(1, workers))
+        blob_shas = await asyncio.gather(*(create_blob(session, sem, repo, fp) for fp, _ in pairs))
+        
+        tree = [
+            {
+                "path": remote_path,
+                "mode": "100755" if os.access(file_path, os.X_OK) else "100644",
+                "type": "blob",
+                "sha": blob_sha
+            }
+            for (file_path, remote_path), blob_sha in zip(pairs, blob_shas)
+        ]
+        async with _request(session, 'POST', f"{GITHUB_API_URL}/repos/{repo}/git/trees",
+                            json={"base_tree": head_tree, "tree": tree}) as response:
+            response.raise_for_status()
+            new_tree = (await response.json())['sha']
+        
+        async with _request(session, 'POST', f"{GITHUB_API_URL}/repos/{repo}/git/commits", json={
+            "message": f"Upload {len(pairs)} files via photonic_uploader",
+            "tree": new_tree,
+            "parents": [head_commit]
+        }) as response:
+            response.raise_for_status()
+            new_commit = (await response.json())['sha']
+        
+        async with _request(session, 'PATCH', f"{GITHUB_API_URL}/repos/{repo}/git/refs/heads/{branch}",
+                            json={"sha": new_commit}) as response:
+            response.raise_for_status()
+    except REQUEST_ERRORS as e:
+        print(f"❌ Failed to commit files: {e}")
+        return seeded + skipped
+    
+    for _, remote_path in pairs:
+        print(f"✅ Uploaded: {remote_path}")
+    return seeded + skipped + len(pairs)
+
+async def create_repo(session, repo_name):
     url = f"{GITHUB_API_URL}/user/repos"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json",
-        "Content-Type": "application/json"
-    }
     data = {"name": repo_name, "private": False, "description": "Photonic Computing Platform"}
     
-    # Create unverified SSL context
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-
     try:
-        req = urllib.request.Request(url, data=json.dumps(data).encode('utf-8'), headers=headers, method='POST')
-        with urllib.request.urlopen(req, context=ctx) as response:
+        async with _request(session, 'POST', url, json=data) as response:
             if response.status == 201:
                 print(f"✅ Created repository: {repo_name}")
                 return True
-    except urllib.error.HTTPError as e:
+            print(f"❌ Failed to create repository: HTTP {response.status}")
+            print(await response.text())
+            return False
+    except REQUEST_ERRORS as e:
         print(f"❌ Failed to create repository: {e}")
-        try:
-            print(e.read().decode('utf-8'))
-        except:
-            pass
         return False
-    return False
 
-def check_repo_exists(token, full_repo):
+async def check_repo_exists(session, full_repo):
     url = f"{GITHUB_API_URL}/repos/{full_repo}"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    # Create unverified SSL context
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-
     try:
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, context=ctx) as response:
+        async with _request(session, 'GET', url) as response:
             return response.status == 200
-    except urllib.error.HTTPError:
+    except REQUEST_ERRORS:
         return False
 
-def main():
+async def _ask(prompt):
+    """input() without blocking the event loop"""
+    return await asyncio.to_thread(input, prompt)
+
+async def _run(workers):
     print("="*60)
     print("   Photonic Computing GitHub Uploader (No Git Required)")
     print("="*60)
     
     # Get user input
-    token = input("Enter your GitHub Personal Access Token: ").strip()
+    token = (await _ask("Enter your GitHub Personal Access Token: ")).strip()
     if not token:
         print("Error: Token is required.")
         return
         
-    username = input("Enter your GitHub Username: ").strip()
-    repo_name = input("Enter the Repository Name (e.g., photonic_computing): ").strip()
+    username = (await _ask("Enter your GitHub Username: ")).strip()
+    repo_name = (await _ask("Enter the Repository Name (e.g., photonic_computing): ")).strip()
     
     full_repo = f"{username}/{repo_name}"
     
+    # One event loop drives all connections; keep-alive sockets are shared
+    headers = {
+        "Authorization": f"token {token}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+    connector = aiohttp.TCPConnector(limit=max(16, workers), ttl_dns_cache=300, ssl=SSL_CTX)
+    async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+        await _upload_project(session, full_repo, repo_name, workers)
+
+async def _upload_project(session, full_repo, repo_name, workers):
     print(f"\nChecking repository {full_repo}...")
-    if not check_repo_exists(token, full_repo):
+    if not await check_repo_exists(session, full_repo):
         print(f"Repository {full_repo} does not exist.")
-        create = input(f"Do you want to create it now? (y/n): ").lower()
+        create = (await _ask(f"Do you want to create it now? (y/n): ")).lower()
         if create == 'y':
-            if not create_repo(token, repo_name):
+            if not await create_repo(session, repo_name):
                 print("Aborting.")
                 return
         else:
@@ -189,40 +381,31 @@ def main():
     
     print(f"\nPreparing to upload to {full_repo}...")
     
-    ignore_patterns = load_gitignore(PROJECT_ROOT)
-    
-    files_to_upload = []
-    
-    # Walk directory
-    for root, dirs, files in os.walk(PROJECT_ROOT):
-        # Filter directories in place
-        dirs[:] = [d for d in dirs if not is_ignored(os.path.join(root, d), PROJECT_ROOT, ignore_patterns)]
-        
-        for file in files:
-            file_path = os.path.join(root, file)
-            if not is_ignored(file_path, PROJECT_ROOT, ignore_patterns):
-                # Don't upload this script itself if you want, but usually it's fine
-                # Don't upload .git directory if it exists
-                if '.git' in file_path.split(os.sep):
-                    continue
-                files_to_upload.append(file_path)
+    ignore_regex = load_gitignore(PROJECT_ROOT)
+    files_to_upload = list(walk_fast(PROJECT_ROOT, ignore_regex))
     
     print(f"Found {len(files_to_upload)} files to upload.")
-    confirm = input("Proceed? (y/n): ").lower()
+    confirm = (await _ask("Proceed? (y/n): ")).lower()
     if confirm != 'y':
         print("Aborted.")
         return
         
-    success_count = 0
-    for file_path in files_to_upload:
-        rel_path = os.path.relpath(file_path, PROJECT_ROOT)
-        if upload_file(token, full_repo, file_path, rel_path):
-            success_count += 1
+    # Blobs are uploaded concurrently and committed together as one commit
+    pairs = [(fp, os.path.relpath(fp, PROJECT_ROOT)) for fp in files_to_upload]
+    success_count = await commit_files(session, full_repo, pairs, workers=workers)
             
     print("\n" + "="*60)
     print(f"Upload Complete. {success_count}/{len(files_to_upload)} files uploaded.")
     print(f"View your repository at: https://github.com/{full_repo}")
     print("="*60)
 
+def main():
+    parser = argparse.ArgumentParser(description="Upload this project to GitHub without git")
+    parser.add_argument('--workers', type=int, default=8,
+                        help="Number of concurrent uploads (default: 8)")
+    args = parser.parse_args()
+    
+    asyncio.run(_run(args.workers))
+
 if __name__ == "__main__":
     main()
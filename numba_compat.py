@@ -0,0 +1,63 @@
+"""
+Optional numba support for the simulation kernels
+Kernels are compiled on first use; without numba their NumPy fallbacks run
+"""
+
+import types
+import functools
+
+# Importing numba alone takes about a second, so it is deferred to the first
+# kernel call
+_numba = None  # the numba module once loaded, False if it is not installed
+
+# Kernel bodies loop with prange. Here it is the builtin range; lazy_njit
+# compiles each kernel against numba.prange instead
+prange = range
+
+
+def _load_numba():
+    """Import numba on first use; returns the module, or False if unavailable"""
+    global _numba
+    if _numba is None:
+        try:
+            import numba
+        except ImportError:
+            numba = False
+        _numba = numba
+    return _numba
+
+
+def _with_prange(kernel, numba_prange):
+    """Copy of kernel whose globals see numba's prange; its module is untouched"""
+    scope = dict(kernel.__globals__, prange=numba_prange)
+    func = types.FunctionType(kernel.__code__, scope, kernel.__name__,
+                              kernel.__defaults__, kernel.__closure__)
+    func.__qualname__ = kernel.__qualname__
+    func.__module__ = kernel.__module__
+    return func
+
+
+def lazy_njit(fallback, **options):
+    """
+    Decorator that compiles a kernel with numba.njit(**options) on first call
+    
+    Args:
+        fallback: NumPy implementation with the same signature, used instead
+            of the kernel when numba is not installed
+        **options: Options passed to numba.njit
+    """
+    def decorate(kernel):
+        impl = None
+        
+        @functools.wraps(kernel)
+        def dispatch(*args):
+            nonlocal impl
+            if impl is None:
+                numba = _load_numba()
+                if numba:
+                    impl = numba.njit(**options)(_with_prange(kernel, numba.prange))
+                else:
+                    impl = fallback
+            return impl(*args)
+        return dispatch
+    return decorate
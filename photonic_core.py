@@ -6,10 +6,16 @@ This module implements a photonic processor using silicon photonics
 with integrated optical computing elements for PCIe and FPGA integration.
 """
 
+import math
+import operator
+from collections import OrderedDict
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
-import numba
+
+# The simulation kernels are numba-compiled on first use when available
+# (cached on disk after the first run), with NumPy fallbacks otherwise
+from numba_compat import lazy_njit, prange
 
 
 @dataclass
@@ -69,8 +75,8 @@ class MachZehnderModulator:
             voltage: Applied voltage in volts
             v_pi: Half-wave voltage
         """
-        phase_shift = np.pi * voltage / v_pi
-        return 0.5 * (1 + np.cos(phase_shift))
+        # Scalar path; encode_data covers arrays
+        return 0.5 * (1.0 + math.cos(math.pi * voltage / v_pi))
     
     def encode_data(self, data: np.ndarray, v_pi: float = 3.0) -> np.ndarray:
         """
@@ -80,8 +86,12 @@ class MachZehnderModulator:
             data: Binary data array
             v_pi: Half-wave voltage
         """
-        voltages = data * v_pi
-        return np.array([self.modulation_depth(v, v_pi) for v in voltages])
+        # voltages = data * v_pi, so the phase pi * V / v_pi is just pi * data
+        phase = np.multiply(np.asarray(data, dtype=np.float64), np.pi)
+        np.cos(phase, out=phase)
+        phase += 1.0
+        phase *= 0.5
+        return phase
 
 
 @dataclass
@@ -95,6 +105,7 @@ class RingResonator:
     coupling_coefficient: float = 0.1
     quality_factor: float = 10000.0
     free_spectral_range: float = 20.0  # nm
+    _wavelength_cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
     
     def resonance_wavelengths(self, center: float = 1550.0, num: int = 8) -> np.ndarray:
         """
@@ -103,29 +114,101 @@ class RingResonator:
         Args:
             center: Center wavelength in nm
             num: Number of WDM channels
+        
+        Returns:
+            Read-only array, cached per (center, num, FSR)
         """
         fsr = self.free_spectral_range
-        wavelengths = center + fsr * np.arange(-num//2, num//2)
+        key = (center, num, fsr)
+        wavelengths = self._wavelength_cache.get(key)
+        if wavelengths is None:
+            wavelengths = center + fsr * np.arange(-num//2, num//2, dtype=np.float64)
+            wavelengths.flags.writeable = False
+            self._wavelength_cache[key] = wavelengths
         return wavelengths
     
     def transmission_spectrum(self, wavelengths: np.ndarray, 
-                            resonance: float = 1550.0) -> np.ndarray:
+                            resonance: float = 1550.0,
+                            out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Calculate transmission spectrum
         
         Args:
             wavelengths: Array of wavelengths to evaluate
             resonance: Resonance wavelength
+            out: Optional float64 buffer (same shape as wavelengths) to write into
         """
         Q = self.quality_factor
         kappa = self.coupling_coefficient
-        
-        # Lorentzian lineshape
-        delta = (wavelengths - resonance) / resonance
         gamma = 1.0 / (2 * Q)
         
-        transmission = 1 - kappa**2 / (delta**2 + gamma**2)
-        return transmission
+        # Lorentzian lineshape, evaluated in a single buffer
+        if out is None:
+            out = np.empty(np.shape(wavelengths), dtype=np.float64)
+        np.subtract(wavelengths, resonance, out=out)
+        out *= 1.0 / resonance
+        out *= out
+        out += gamma * gamma
+        np.divide(-kappa * kappa, out, out=out)
+        out += 1.0
+        return out if out.ndim else out[()]
+
+
+def _mzi_apply_numpy(state: np.ndarray, c: np.ndarray, sr: np.ndarray, si: np.ndarray, size: int):
+    """NumPy fallback for _mzi_apply; each MZI rotates whole rows of the block"""
+    z = state.view(np.complex128)[..., 0]
+    c = c.tolist()
+    s = (sr + 1j * si).tolist()
+    idx = 0
+    for i in range(size - 1):
+        n = size - 1 - i
+        # Row j only meets row i as it was after MZIs (i, i+1..j-1), so carry
+        # row i through the stage and update the other rows in one pass
+        rows = z[i + 1:]
+        seen = np.empty_like(rows)
+        x = z[i].copy()
+        for j in range(n):
+            seen[j] = x
+            x *= c[idx + j]
+            x -= s[idx + j] * rows[j]
+        rows *= np.array(c[idx:idx + n])[:, None]
+        rows += np.conj(s[idx:idx + n])[:, None] * seen
+        z[i] = x
+        idx += n
+
+
+@lazy_njit(_mzi_apply_numpy, cache=True, fastmath=True)
+def _mzi_apply(state: np.ndarray, c: np.ndarray, sr: np.ndarray, si: np.ndarray, size: int):
+    """
+    Propagate a block of states through the triangular MZI mesh in place
+    
+    Args:
+        state: Complex (size, K) block viewed as (size, K, 2) [real, imag] pairs;
+            each column is one input vector
+        c: cos(theta) per MZI
+        sr, si: Real and imaginary parts of sin(theta)*exp(1j*phi) per MZI
+        size: Mesh dimension
+    """
+    idx = 0
+    for i in range(size):
+        for j in range(i + 1, size):
+            # Coefficients in locals so the stores to state can't force reloads
+            ck = c[idx]
+            srk = sr[idx]
+            sik = si[idx]
+            row_i = state[i]
+            row_j = state[j]
+            for k in range(state.shape[1]):
+                xr = row_i[k, 0]
+                xi = row_i[k, 1]
+                yr = row_j[k, 0]
+                yi = row_j[k, 1]
+                # [x, y] <- [c*x - s*y, conj(s)*x + c*y] in real arithmetic
+                row_i[k, 0] = ck * xr - (srk * yr - sik * yi)
+                row_i[k, 1] = ck * xi - (srk * yi + sik * yr)
+                row_j[k, 0] = (srk * xr + sik * xi) + ck * yr
+                row_j[k, 1] = (srk * xi - sik * xr) + ck * yi
+            idx += 1
 
 
 class PhotonicMatrixMultiplier:
@@ -135,25 +218,27 @@ class PhotonicMatrixMultiplier:
     Implements O(1) matrix multiplication using optical interference
     """
     
-    def __init__(self, size: int):
+    def __init__(self, size: int, dtype=np.complex64):
         """
         Initialize photonic matrix multiplier
         
         Args:
             size: Matrix dimension (NxN)
+            dtype: Complex precision of the realized unitary; complex64 halves
+                the working set and is well beyond the few-bit precision of
+                physical phase shifters. Use np.complex128 for reference runs.
         """
         self.size = size
         self.num_mzi = size * (size - 1) // 2  # Triangular mesh
+        self.dtype = np.dtype(dtype)
+        real_dtype = np.finfo(self.dtype).dtype
         
-        # Phase shifters for matrix encoding
-        self.theta = np.random.uniform(0, 2*np.pi, self.num_mzi)
-        self.phi = np.random.uniform(0, 2*np.pi, self.num_mzi)
+        # Phase shifters for matrix encoding; the mesh is fully described by
+        # these arrays (structure-of-arrays, no per-MZI objects)
+        self.theta = np.random.uniform(0, 2*np.pi, self.num_mzi).astype(real_dtype)
+        self.phi = np.random.uniform(0, 2*np.pi, self.num_mzi).astype(real_dtype)
         
-        # Waveguides
-        self.waveguides = [PhotonicWaveguide() for _ in range(size)]
-        
-        # MZI modulators
-        self.mzi_array = [MachZehnderModulator() for _ in range(self.num_mzi)]
+        self._update_coefficients()
     
     def encode_matrix(self, matrix: np.ndarray):
         """
@@ -162,66 +247,92 @@ class PhotonicMatrixMultiplier:
         Args:
             matrix: Unitary matrix to encode
         """
-        # Simplified Clements decomposition
+        # Simplified Clements decomposition: one MZI per upper-triangle
+        # element, in row-major (i, j) order
         U = matrix.astype(complex)
-        n = self.size
+        iu, ju = np.triu_indices(self.size, k=1)
+        vals = U[iu, ju][:self.num_mzi]
+        self.theta[:] = np.angle(vals)
+        self.phi[:] = np.abs(vals)
         
-        idx = 0
-        for i in range(n):
-            for j in range(i+1, n):
-                if idx < self.num_mzi:
-                    # Extract phase from matrix element
-                    self.theta[idx] = np.angle(U[i, j])
-                    self.phi[idx] = np.abs(U[i, j])
-                    idx += 1
+        self._update_coefficients()
     
     def multiply(self, vector: np.ndarray) -> np.ndarray:
         """
         Perform matrix-vector multiplication optically
         
         Args:
-            vector: Input vector (optical amplitudes)
+            vector: Input vector (optical amplitudes), at least self.size long;
+                entries past the mesh's size pass through unchanged
         
         Returns:
             Output vector after optical transformation
         """
-        # Simulate optical propagation through MZI mesh
-        state = vector.astype(complex)
-        
-        idx = 0
-        for i in range(self.size):
-            for j in range(i+1, self.size):
-                if idx < self.num_mzi:
-                    # Apply MZI transformation
-                    theta = self.theta[idx]
-                    phi = self.phi[idx]
-                    
-                    # Unitary transformation
-                    c = np.cos(theta)
-                    s = np.sin(theta) * np.exp(1j * phi)
-                    
-                    # Apply to state
-                    temp_i = c * state[i] - s * state[j]
-                    temp_j = s.conj() * state[i] + c * state[j]
-                    
-                    state[i] = temp_i
-                    state[j] = temp_j
-                    
-                    idx += 1
-        
+        state = np.array(vector, dtype=self.dtype)
+        if state.shape[0] < self.size:
+            raise ValueError(f"Vector length {state.shape[0]} is smaller than the "
+                             f"{self.size}-port mesh")
+        # The mesh realizes the fixed unitary _U, so propagation is one GEMV
+        state[:self.size] = self._U @ state[:self.size]
         return state
     
+    def multiply_batch(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Multiply a block of vectors in one pass (one GEMM instead of K GEMVs)
+        
+        Args:
+            vectors: Input block of shape (N, K), one vector per column
+                (e.g. one per WDM channel)
+        
+        Returns:
+            Output block of shape (N, K)
+        """
+        return self._U @ np.ascontiguousarray(vectors, dtype=self.dtype)
+    
+    def _update_coefficients(self):
+        """
+        Precompute the MZI coefficients and the unitary the mesh realizes
+        
+        Phases only change in encode_matrix, so multiply() never touches
+        the mesh itself.
+        """
+        # Built in double precision whatever self.dtype is: the O(N^3) sweep
+        # drives many entries of a float32 block into denormals, which is
+        # ~10x slower than rounding the finished unitary once
+        theta = self.theta.astype(np.float64)
+        phi = self.phi.astype(np.float64)
+        sin_theta = np.sin(theta)
+        self._c = np.cos(theta)
+        self._sr = sin_theta * np.cos(phi)
+        self._si = sin_theta * np.sin(phi)
+        
+        # Push the identity through the mesh once to get the realized unitary
+        U = np.eye(self.size, dtype=np.complex128)
+        _mzi_apply(U.view(np.float64).reshape(self.size, self.size, 2),
+                   self._c, self._sr, self._si, self.size)
+        self._U = U.astype(self.dtype, copy=False)
+    
     def compute_throughput(self) -> float:
         """
         Calculate computational throughput in TOPS (Tera-Operations Per Second)
         
         Photonic computing achieves O(1) latency for matrix multiplication
         """
+        return self.throughput_for_size(self.size)
+    
+    @staticmethod
+    def throughput_for_size(size: int) -> float:
+        """
+        Throughput in TOPS of a size x size mesh, without building one
+        
+        Args:
+            size: Matrix dimension (NxN)
+        """
         # Optical propagation time
         propagation_time_ns = 0.01  # 10 picoseconds
         
         # Operations per multiplication
-        ops = self.size ** 2
+        ops = size ** 2
         
         # Throughput
         throughput_tops = ops / (propagation_time_ns * 1e-9) / 1e12
@@ -229,6 +340,61 @@ class PhotonicMatrixMultiplier:
         return throughput_tops
 
 
+_CARRIER_ANCHOR = 256
+
+# Carrier tables kept per multiplexer: the most recent signal lengths only,
+# and none larger than this many bytes (64 channels x 256k samples)
+_CARRIER_CACHE_ENTRIES = 4
+_CARRIER_CACHE_MAX_BYTES = 256 * 2**20
+
+
+def _wdm_demux_numpy(signal: np.ndarray, wavelengths: np.ndarray, out: np.ndarray):
+    """NumPy fallback for _wdm_demux, one channel's carrier at a time"""
+    t = np.arange(out.shape[1])
+    for k in range(out.shape[0]):
+        np.abs(signal * np.exp(-2j * np.pi * wavelengths[k] * t), out=out[k])
+
+
+@lazy_njit(_wdm_demux_numpy, parallel=True, fastmath=True, cache=True)
+def _wdm_demux(signal: np.ndarray, wavelengths: np.ndarray, out: np.ndarray):
+    """
+    Mix the signal with each channel's conjugate carrier and take the magnitude
+    
+    Writes channel k into out[k]; carriers are generated on the fly.
+    """
+    num_channels, n = out.shape
+    for k in prange(num_channels):
+        omega = -2.0 * np.pi * wavelengths[k]
+        for i in range(n):
+            phase = omega * i
+            out[k, i] = abs(signal[i] * complex(np.cos(phase), np.sin(phase)))
+
+
+def _build_carriers_numpy(wavelengths: np.ndarray, n: int, out: np.ndarray):
+    """NumPy fallback for _build_carriers; exact exp, no recurrence"""
+    np.exp(2j * np.pi * np.outer(wavelengths, np.arange(n)), out=out)
+
+
+@lazy_njit(_build_carriers_numpy, cache=True)
+def _build_carriers(wavelengths: np.ndarray, n: int, out: np.ndarray):
+    """
+    Fill out[k] with exp(2j*pi*wavelengths[k]*t) by phase recurrence
+    
+    Each sample is the previous one times the per-channel step
+    exp(2j*pi*wavelength), re-anchored with a direct exp every
+    _CARRIER_ANCHOR samples so rounding error cannot accumulate.
+    """
+    for k in range(wavelengths.shape[0]):
+        omega = 2.0 * np.pi * wavelengths[k]
+        step = complex(np.cos(omega), np.sin(omega))
+        c = 1.0 + 0.0j
+        for i in range(n):
+            if i % _CARRIER_ANCHOR == 0:
+                c = complex(np.cos(omega * i), np.sin(omega * i))
+            out[k, i] = c
+            c *= step
+
+
 class WDMMultiplexer:
     """
     Wavelength Division Multiplexing for parallel optical channels
@@ -253,6 +419,35 @@ class WDMMultiplexer:
         
         # Channel spacing
         self.channel_spacing = (self.wavelengths[-1] - self.wavelengths[0]) / (num_channels - 1)
+        
+        # Carrier tables, keyed by signal length, least recently used first
+        self._carrier_cache = OrderedDict()
+    
+    def _carriers(self, n: int) -> np.ndarray:
+        """
+        Carrier table exp(2j*pi*wavelength*t) for every channel
+        
+        The last few tables up to _CARRIER_CACHE_MAX_BYTES are kept; larger
+        ones are rebuilt on every call rather than pinned in memory.
+        
+        Args:
+            n: Signal length
+        
+        Returns:
+            Read-only (num_channels, n) complex array
+        """
+        carriers = self._carrier_cache.get(n)
+        if carriers is not None:
+            self._carrier_cache.move_to_end(n)
+            return carriers
+        carriers = np.empty((self.num_channels, n), dtype=np.complex128)
+        _build_carriers(self.wavelengths, n, carriers)
+        carriers.flags.writeable = False
+        if carriers.nbytes <= _CARRIER_CACHE_MAX_BYTES:
+            self._carrier_cache[n] = carriers
+            if len(self._carrier_cache) > _CARRIER_CACHE_ENTRIES:
+                self._carrier_cache.popitem(last=False)
+        return carriers
     
     def multiplex(self, data_channels: List[np.ndarray]) -> np.ndarray:
         """
@@ -264,16 +459,11 @@ class WDMMultiplexer:
         Returns:
             Multiplexed optical signal
         """
-        # Simulate WDM multiplexing
-        multiplexed = np.zeros(len(data_channels[0]), dtype=complex)
-        
-        for i, data in enumerate(data_channels):
-            # Modulate each wavelength
-            wavelength = self.wavelengths[i]
-            carrier = np.exp(2j * np.pi * wavelength * np.arange(len(data)))
-            multiplexed += data * carrier
-        
-        return multiplexed
+        # Simulate WDM multiplexing: the carrier table is fixed per signal
+        # length, so this is a single weighted sum over channels
+        D = np.stack(data_channels)
+        k, n = D.shape
+        return np.einsum('kn,kn->n', D, self._carriers(n)[:k])
     
     def demultiplex(self, signal: np.ndarray) -> List[np.ndarray]:
         """
@@ -285,22 +475,14 @@ class WDMMultiplexer:
         Returns:
             List of demultiplexed data channels
         """
-        channels = []
+        # Simplified demultiplexing (coherent detection), fused into one
+        # kernel so no per-channel carrier or product arrays are allocated
+        signal = np.ascontiguousarray(signal, dtype=np.complex128)
+        out = np.empty((self.num_channels, len(signal)), dtype=np.float64)
+        _wdm_demux(signal, self.wavelengths, out)
         
-        for i in range(self.num_channels):
-            wavelength = self.wavelengths[i]
-            
-            # Filter using ring resonator
-            resonator = self.resonators[i]
-            
-            # Simplified demultiplexing (coherent detection)
-            carrier = np.exp(-2j * np.pi * wavelength * np.arange(len(signal)))
-            demodulated = signal * carrier
-            
-            # Low-pass filter
-            channels.append(np.abs(demodulated))
-        
-        return channels
+        # Row views into the one block; no per-channel copies
+        return list(out)
     
     def aggregate_bandwidth(self) -> float:
         """
@@ -309,28 +491,74 @@ class WDMMultiplexer:
         Returns:
             Total bandwidth in Tbps
         """
+        return self.bandwidth_for_channels(self.num_channels)
+    
+    @staticmethod
+    def bandwidth_for_channels(num_channels: int) -> float:
+        """
+        Aggregate bandwidth in Tbps for num_channels, without building a multiplexer
+        
+        Args:
+            num_channels: Number of wavelength channels
+        """
         # Assume 100 Gbps per channel
         per_channel_gbps = 100.0
-        total_tbps = (self.num_channels * per_channel_gbps) / 1000.0
+        total_tbps = (num_channels * per_channel_gbps) / 1000.0
         
         return total_tbps
 
 
-@numba.jit(nopython=True, cache=True)
+def _optical_fft_numpy(data: np.ndarray) -> np.ndarray:
+    """NumPy fallback for _optical_fft_kernel; pocketfft handles any length"""
+    return np.fft.fft(np.asarray(data, dtype=np.complex128), norm="ortho")
+
+
+@lazy_njit(_optical_fft_numpy, cache=True, fastmath=True)
 def _optical_fft_kernel(data: np.ndarray) -> np.ndarray:
     """
     Fast optical Fourier transform using photonic circuits
     
-    Achieves O(log N) depth instead of O(N log N) for electronic FFT
+    Mirrors the log2(N)-stage butterfly network of the optical circuit:
+    iterative radix-2 Cooley-Tukey, O(N log N). Sizes that are not a power
+    of two fall back to a direct O(N^2) DFT.
     """
     n = len(data)
-    result = np.zeros(n, dtype=np.complex128)
+    result = np.empty(n, dtype=np.complex128)
     
-    # Butterfly network implementation
+    if n == 0 or (n & (n - 1)) != 0:
+        for i in range(n):
+            acc = 0j
+            for j in range(n):
+                acc += data[j] * np.exp(-2j * np.pi * i * j / n)
+            result[i] = acc
+        return result / np.sqrt(n)
+    
+    # Bit-reversal permutation
+    log2n = 0
+    while (1 << log2n) < n:
+        log2n += 1
     for i in range(n):
-        for j in range(n):
-            phase = -2.0 * np.pi * i * j / n
-            result[i] += data[j] * np.exp(1j * phase)
+        rev = 0
+        x = i
+        for _ in range(log2n):
+            rev = (rev << 1) | (x & 1)
+            x >>= 1
+        result[rev] = data[i]
+    
+    # Twiddle table shared by all stages
+    twiddle = np.exp(-2j * np.pi * np.arange(n // 2) / n)
+    
+    # Butterfly network
+    for s in range(1, log2n + 1):
+        m = 1 << s
+        half = m >> 1
+        step = n // m
+        for k in range(0, n, m):
+            for j in range(half):
+                t = twiddle[j * step] * result[k + j + half]
+                u = result[k + j]
+                result[k + j] = u + t
+                result[k + j + half] = u - t
     
     return result / np.sqrt(n)
 
@@ -342,6 +570,9 @@ class PhotonicFFT:
     Uses optical delay lines and interferometers for ultra-fast FFT
     """
     
+    # Speed of light in silicon
+    C_SILICON = 3e8 / 3.48  # m/s
+    
     def __init__(self, size: int):
         """
         Initialize photonic FFT
@@ -349,12 +580,16 @@ class PhotonicFFT:
         Args:
             size: FFT size (power of 2)
         """
+        # The delay-line structure is radix-2; int(np.log2()) would silently
+        # truncate any other size to a smaller network
+        size = operator.index(size)  # NumPy integers have no bit_length()
+        if size <= 0 or size & (size - 1):
+            raise ValueError(f"FFT size must be a power of 2, got {size}")
         self.size = size
-        self.stages = int(np.log2(size))
+        self.stages = size.bit_length() - 1
         
-        # Delay lines for each stage
-        self.delay_lines = [PhotonicWaveguide(length=1000.0 * (2**i)) 
-                           for i in range(self.stages)]
+        # Delay line length per stage (μm), doubling each stage
+        self.delay_lengths_um = 1000.0 * (1 << np.arange(self.stages))
     
     def compute(self, data: np.ndarray) -> np.ndarray:
         """
@@ -366,6 +601,13 @@ class PhotonicFFT:
         Returns:
             FFT of input data
         """
+        # pocketfft's SIMD radix kernels beat the numba butterfly; the kernel
+        # still covers inputs whose length is not a power of two
+        n = len(data)
+        if n == 0:
+            return np.empty(0, dtype=np.complex128)  # np.fft rejects empty input
+        if n & (n - 1) == 0:
+            return np.fft.fft(data, norm="ortho")
         return _optical_fft_kernel(data)
     
     def latency_ns(self) -> float:
@@ -375,16 +617,26 @@ class PhotonicFFT:
         Returns:
             Latency in nanoseconds
         """
-        # Speed of light in silicon
-        c_silicon = 3e8 / 3.48  # m/s
-        
         # Total optical path length
-        total_length_m = sum(wg.length for wg in self.delay_lines) * 1e-6
+        total_length_m = self.delay_lengths_um.sum() * 1e-6
         
         # Propagation time
-        latency = (total_length_m / c_silicon) * 1e9  # ns
+        latency = (total_length_m / self.C_SILICON) * 1e9  # ns
         
         return latency
+    
+    @staticmethod
+    def latency_for_size(size: int) -> float:
+        """
+        Latency in ns of a size-point FFT, without building the delay lines
+        
+        Args:
+            size: FFT size (power of 2)
+        """
+        # Delay lines double each stage, so they sum to 1000 um * (2**stages - 1)
+        stages = operator.index(size).bit_length() - 1
+        total_length_m = 1000.0 * ((1 << stages) - 1) * 1e-6
+        return (total_length_m / PhotonicFFT.C_SILICON) * 1e9
 
 
 def calculate_photonic_performance(matrix_size: int = 1024, 
@@ -399,17 +651,11 @@ def calculate_photonic_performance(matrix_size: int = 1024,
     Returns:
         Dictionary of performance metrics
     """
-    # Matrix multiplier
-    mm = PhotonicMatrixMultiplier(matrix_size)
-    mm_throughput = mm.compute_throughput()
-    
-    # WDM system
-    wdm = WDMMultiplexer(num_wdm_channels)
-    total_bandwidth = wdm.aggregate_bandwidth()
-    
-    # FFT processor
-    fft = PhotonicFFT(matrix_size)
-    fft_latency = fft.latency_ns()
+    # All metrics follow from the sizes alone, so no simulation objects
+    # (and no matrix_size x matrix_size mesh) are built
+    mm_throughput = PhotonicMatrixMultiplier.throughput_for_size(matrix_size)
+    total_bandwidth = WDMMultiplexer.bandwidth_for_channels(num_wdm_channels)
+    fft_latency = PhotonicFFT.latency_for_size(matrix_size)
     
     # Aggregate performance
     total_throughput = mm_throughput * num_wdm_channels
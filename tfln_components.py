@@ -3,11 +3,16 @@ Thin-Film Lithium Niobate (TFLN) Photonic Components
 Advanced electro-optic modulators and integrated photonic devices
 """
 
+import math
+import functools
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 from enum import Enum
 
+# Kernels are compiled by numba on first use, with NumPy fallbacks
+from numba_compat import lazy_njit, prange
+
 
 class TFLNWaferType(Enum):
     """TFLN wafer types"""
@@ -23,9 +28,39 @@ class ModulationFormat(Enum):
     PAM8 = "8-level PAM"
     QAM16 = "16-QAM"
     QAM64 = "64-QAM"
+    
+    @property
+    def bits_per_symbol(self) -> int:
+        """Bits carried per symbol"""
+        return _BITS_PER_SYMBOL[self]
+
+
+_BITS_PER_SYMBOL = {
+    ModulationFormat.OOK: 1,
+    ModulationFormat.PAM4: 2,
+    ModulationFormat.PAM8: 3,
+    ModulationFormat.QAM16: 4,
+    ModulationFormat.QAM64: 6,
+}
 
+# Formats a single intensity MZM can encode directly (QAM needs I/Q)
+_AMPLITUDE_FORMATS = (ModulationFormat.OOK, ModulationFormat.PAM4, ModulationFormat.PAM8)
 
-@dataclass
+# Drive swing relative to Vπ: multi-level formats are driven harder to
+# open their inner eyes
+_DRIVE_SCALE = {
+    ModulationFormat.OOK: 1.0,
+    ModulationFormat.PAM4: 1.0,
+    ModulationFormat.PAM8: 1.2,
+    ModulationFormat.QAM16: 1.5,
+    ModulationFormat.QAM64: 1.5,
+}
+
+# log10(e), for dB <-> neper conversion
+_LOG10_E = 0.43429448190325176
+
+
+@dataclass(frozen=True, slots=True)
 class TFLNMaterialProperties:
     """Material properties of thin-film lithium niobate"""
     
@@ -49,17 +84,68 @@ class TFLNMaterialProperties:
     chi2: float = 27.0  # pm/V (second-order)
     chi3: float = 2.5e-22  # m²/V² (third-order)
     
+    # Coefficient that the applied field drives for each cut. A plain class
+    # attribute (not a field); maps to names so overridden r-values still apply
+    _POCKELS = {
+        TFLNWaferType.X_CUT: 'r33',
+        TFLNWaferType.Y_CUT: 'r22',
+        TFLNWaferType.Z_CUT: 'r13',
+    }
+    
     def get_pockels_coefficient(self, wafer_type: TFLNWaferType) -> float:
         """Get effective Pockels coefficient based on wafer cut"""
-        if wafer_type == TFLNWaferType.X_CUT:
-            return self.r33
-        elif wafer_type == TFLNWaferType.Y_CUT:
-            return self.r22
-        else:  # Z-cut
-            return self.r13
+        return getattr(self, self._POCKELS[wafer_type])
 
 
-@dataclass
+# Every component uses the same bulk material; it is immutable, so one
+# instance is shared rather than rebuilt in each __post_init__
+_MATERIAL = TFLNMaterialProperties()
+
+
+def vpi_vectorized(lengths_mm, gap_um, wavelength_nm: float,
+                   r_eff_pm_per_V: float, n_eff: float, overlap: float = 0.8):
+    """
+    Closed-form half-wave voltage Vπ = λ·d / (n³·r·Γ·L)
+    
+    Args:
+        lengths_mm: Interaction length(s) in mm (scalar or array)
+        gap_um: Electrode gap(s) in μm (scalar or array broadcastable with lengths_mm)
+        wavelength_nm: Optical wavelength in nm
+        r_eff_pm_per_V: Effective Pockels coefficient in pm/V
+        n_eff: Effective index of the optical mode
+        overlap: Electro-optic overlap factor Γ
+    
+    Returns:
+        Vπ in volts, same shape as lengths_mm
+    """
+    wavelength_m = wavelength_nm * 1e-9
+    gap_m = np.asarray(gap_um) * 1e-6
+    length_m = np.asarray(lengths_mm) * 1e-3
+    return (wavelength_m * gap_m) / (n_eff**3 * r_eff_pm_per_V * 1e-12 * overlap * length_m)
+
+
+@functools.lru_cache(maxsize=256)
+def _marcatili_n_eff(width_um: float, wavelength_nm: float, n_core: float) -> float:
+    """
+    Effective index of a waveguide core (simplified Marcatili method)
+    
+    Memoized across all waveguides: sweeps that vary a non-waveguide
+    parameter (length, gap, radius) reuse the same few geometries.
+    """
+    n_clad = 1.45  # SiO2 cladding
+    
+    # Confinement factor approximation
+    V = (2 * math.pi / (wavelength_nm * 1e-3)) * width_um * math.sqrt(n_core**2 - n_clad**2)
+    
+    if V < 2.405:  # Single mode
+        b = (V / 2.405)**2
+    else:
+        b = 1 - (2.405 / V)**2
+    
+    return n_clad + (n_core - n_clad) * b
+
+
+@dataclass(slots=True)
 class TFLNWaveguide:
     """Thin-film lithium niobate waveguide"""
     
@@ -69,25 +155,14 @@ class TFLNWaveguide:
     wafer_type: TFLNWaferType
     wavelength: float = 1550.0  # nm
     
-    def __post_init__(self):
-        self.material = TFLNMaterialProperties()
+    # Not constructor arguments; declared as fields so the class can use
+    # __slots__ (every component class below follows the same pattern)
+    material: TFLNMaterialProperties = field(default=_MATERIAL, init=False, repr=False, compare=False)
     
     def effective_index(self, polarization: str = 'TE') -> float:
         """Calculate effective refractive index"""
-        # Simplified effective index using Marcatili's method
         n_core = self.material.n_extraordinary if polarization == 'TE' else self.material.n_ordinary
-        n_clad = 1.45  # SiO2 cladding
-        
-        # Confinement factor approximation
-        V = (2 * np.pi / (self.wavelength * 1e-3)) * self.width * np.sqrt(n_core**2 - n_clad**2)
-        
-        if V < 2.405:  # Single mode
-            b = (V / 2.405)**2
-        else:
-            b = 1 - (2.405 / V)**2
-        
-        n_eff = n_clad + (n_core - n_clad) * b
-        return n_eff
+        return _marcatili_n_eff(self.width, self.wavelength, n_core)
     
     def propagation_loss(self, polarization: str = 'TE') -> float:
         """Calculate propagation loss in dB"""
@@ -107,37 +182,108 @@ class TFLNWaveguide:
         return -2.5  # ps/nm/km
 
 
-@dataclass
+def _mzm_transfer_numpy(v: np.ndarray, v_pi: float, out: np.ndarray):
+    """NumPy fallback for _mzm_transfer"""
+    np.cos((np.pi / v_pi) * v, out=out)
+    out += 1.0
+    out *= 0.5
+
+
+@lazy_njit(_mzm_transfer_numpy, parallel=True, fastmath=True, cache=True)
+def _mzm_transfer(v: np.ndarray, v_pi: float, out: np.ndarray):
+    """Fused T(V) = 0.5 * [1 + cos(π·V/Vπ)] over flat arrays"""
+    k = np.pi / v_pi
+    for i in prange(v.size):
+        out[i] = 0.5 * (1.0 + np.cos(k * v[i]))
+
+
+# Optical waveguide width of the MZM arms
+_MZM_WG_WIDTH_UM = 1.5
+
+
+def mzm_sweep(lengths_mm, gaps_um, wafer_type: TFLNWaferType,
+              wavelength_nm: float = 1550.0, overlap: float = 0.8) -> dict:
+    """
+    Closed-form TFLNMachZehnderModulator figures over arrays of designs
+    
+    Gives the same values as building one modulator per (length, gap) and
+    calling its methods, without constructing any objects.
+    
+    Args:
+        lengths_mm: Interaction length(s) in mm
+        gaps_um: Electrode gap(s) in μm; broadcast against lengths_mm
+        wafer_type: Wafer cut (selects the Pockels coefficient)
+        wavelength_nm: Optical wavelength in nm
+        overlap: Electro-optic overlap factor Γ
+    
+    Returns:
+        Dictionary of arrays: 'v_pi' (V), 'bandwidth_ghz', 'insertion_loss_db'
+    """
+    lengths_mm, gaps_um = np.broadcast_arrays(np.asarray(lengths_mm, dtype=np.float64),
+                                              np.asarray(gaps_um, dtype=np.float64))
+    r_eff = _MATERIAL.get_pockels_coefficient(wafer_type)
+    n_eff = _marcatili_n_eff(_MZM_WG_WIDTH_UM, wavelength_nm, _MATERIAL.n_extraordinary)
+    
+    v_pi = vpi_vectorized(lengths_mm, gaps_um, wavelength_nm, r_eff, n_eff, overlap)
+    
+    # Velocity-mismatch limit, capped by the 120 GHz electrode-loss limit
+    v_optical = 3e8 / (n_eff * 1.05)
+    delta_v = abs(v_optical - 1.2e8)
+    bandwidth = np.minimum(0.44 * v_optical / (delta_v * lengths_mm * 1e-3) / 1e9, 120)
+    
+    # Waveguide loss + Y-junction + fiber-chip coupling
+    insertion_loss = _MATERIAL.loss_te * (lengths_mm / 10) + 0.1 + 0.5
+    
+    return {
+        'v_pi': v_pi,
+        'bandwidth_ghz': bandwidth,
+        'insertion_loss_db': insertion_loss,
+    }
+
+
+@dataclass(frozen=True, slots=True)
 class TFLNMachZehnderModulator:
-    """High-performance TFLN Mach-Zehnder modulator"""
+    """
+    High-performance TFLN Mach-Zehnder modulator
+    
+    Frozen: Vπ and the drive levels are derived once from the geometry, so
+    changing a dimension means building a new modulator.
+    """
     
     interaction_length: float  # mm
     electrode_gap: float  # μm
     wafer_type: TFLNWaferType
     wavelength: float = 1550.0  # nm
     
+    material: TFLNMaterialProperties = field(default=_MATERIAL, init=False, repr=False, compare=False)
+    waveguide: Optional[TFLNWaveguide] = field(default=None, init=False, repr=False, compare=False)
+    _v_pi: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    _levels: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
-        self.material = TFLNMaterialProperties()
-        self.waveguide = TFLNWaveguide(
-            width=1.5,
+        object.__setattr__(self, 'waveguide', TFLNWaveguide(
+            width=_MZM_WG_WIDTH_UM,
             height=0.6,
             length=self.interaction_length,
             wafer_type=self.wafer_type,
             wavelength=self.wavelength
-        )
+        ))
+        # Vπ at the default overlap, shared by the drive/encode paths, and
+        # the evenly spaced 0..Vπ drive levels of each amplitude format
+        v_pi = self.half_wave_voltage()
+        object.__setattr__(self, '_v_pi', v_pi)
+        object.__setattr__(self, '_levels', {
+            fmt: np.linspace(0.0, v_pi, 1 << fmt.bits_per_symbol)
+            for fmt in _AMPLITUDE_FORMATS
+        })
     
     def half_wave_voltage(self, overlap_factor: float = 0.8) -> float:
         """Calculate Vπ (half-wave voltage)"""
         r_eff = self.material.get_pockels_coefficient(self.wafer_type)
         n_eff = self.waveguide.effective_index('TE')
         
-        # Vπ = λ·d / (n³·r·Γ·L)
-        wavelength_m = self.wavelength * 1e-9
-        gap_m = self.electrode_gap * 1e-6
-        length_m = self.interaction_length * 1e-3
-        
-        v_pi = (wavelength_m * gap_m) / (n_eff**3 * r_eff * 1e-12 * overlap_factor * length_m)
-        return v_pi
+        return float(vpi_vectorized(self.interaction_length, self.electrode_gap,
+                                    self.wavelength, r_eff, n_eff, overlap_factor))
     
     def modulation_bandwidth(self) -> float:
         """Calculate 3-dB modulation bandwidth (GHz)"""
@@ -160,7 +306,7 @@ class TFLNMachZehnderModulator:
     def extinction_ratio(self, phase_imbalance: float = 0.01) -> float:
         """Calculate extinction ratio (dB)"""
         # ER limited by phase imbalance between arms
-        er = -10 * np.log10((np.pi * phase_imbalance)**2)
+        er = -10 * math.log10((math.pi * phase_imbalance)**2)
         return min(er, 45)  # Practical limit ~45 dB
     
     def insertion_loss(self) -> float:
@@ -172,27 +318,34 @@ class TFLNMachZehnderModulator:
         
         return wg_loss + split_loss + coupling_loss
     
+    def drive_voltage(self, modulation: ModulationFormat) -> float:
+        """Drive voltage swing for a modulation format (V)"""
+        return _DRIVE_SCALE[modulation] * self._v_pi
+    
     def power_consumption(self, data_rate_gbps: float, modulation: ModulationFormat) -> float:
         """Calculate power consumption (W)"""
-        v_pi = self.half_wave_voltage()
+        return float(self.power_consumption_vec(data_rate_gbps, modulation.bits_per_symbol,
+                                                self.drive_voltage(modulation)))
+    
+    def power_consumption_vec(self, data_rates_gbps, bits_per_symbol, v_drive):
+        """
+        Power consumption (W) over arrays of operating points
         
-        # Drive voltage depends on modulation format
-        if modulation == ModulationFormat.OOK:
-            v_drive = v_pi
-        elif modulation == ModulationFormat.PAM4:
-            v_drive = v_pi
-        elif modulation == ModulationFormat.PAM8:
-            v_drive = 1.2 * v_pi
-        else:
-            v_drive = 1.5 * v_pi
+        Args:
+            data_rates_gbps: Data rate(s) in Gbps
+            bits_per_symbol: Bits per symbol for each rate
+            v_drive: Drive voltage swing for each rate (see drive_voltage)
         
+        Returns:
+            Power in W, broadcast over the inputs
+        """
         # Capacitance of traveling wave electrode
         length_m = self.interaction_length * 1e-3
         capacitance = 0.15e-12 * length_m  # F/m typical for TFLN
         
         # Dynamic power: P = C·V²·f
-        symbol_rate = data_rate_gbps / np.log2(4 if modulation == ModulationFormat.PAM4 else 2)
-        power = capacitance * v_drive**2 * symbol_rate * 1e9
+        symbol_rate = np.asarray(data_rates_gbps) / bits_per_symbol
+        power = capacitance * np.square(v_drive) * symbol_rate * 1e9
         
         # Add driver power (typically 0.3-0.5W)
         driver_power = 0.4
@@ -201,33 +354,95 @@ class TFLNMachZehnderModulator:
     
     def transfer_function(self, voltage: np.ndarray) -> np.ndarray:
         """Calculate optical transfer function"""
-        v_pi = self.half_wave_voltage()
-        # T(V) = 0.5 * [1 + cos(π·V/Vπ)]
-        return 0.5 * (1 + np.cos(np.pi * voltage / v_pi))
+        # T(V) = 0.5 * [1 + cos(π·V/Vπ)], one pass with no temporaries
+        voltage = np.asarray(voltage, dtype=np.float64)
+        out = np.empty(voltage.shape)
+        _mzm_transfer(voltage.ravel(), self._v_pi, out.reshape(-1))
+        return out if out.ndim else out[()]
     
     def encode_pam4(self, bits: np.ndarray) -> np.ndarray:
         """Encode bits to PAM4 voltage levels"""
-        v_pi = self.half_wave_voltage()
-        
-        # PAM4 levels: 00, 01, 10, 11
-        levels = {
-            0: 0.0,           # 00
-            1: v_pi / 3,      # 01
-            2: 2 * v_pi / 3,  # 10
-            3: v_pi           # 11
-        }
-        
-        # Group bits into 2-bit symbols
-        symbols = []
-        for i in range(0, len(bits), 2):
-            if i + 1 < len(bits):
-                symbol = bits[i] * 2 + bits[i+1]
-                symbols.append(levels[symbol])
-        
-        return np.array(symbols)
+        return self.encode(bits, ModulationFormat.PAM4)
+    
+    def encode(self, bits: np.ndarray, modulation: ModulationFormat) -> np.ndarray:
+        """
+        Encode bits to drive voltage levels of an amplitude format
+        
+        Args:
+            bits: Bit stream, MSB of each symbol first; a trailing partial
+                symbol is dropped
+            modulation: OOK, PAM4 or PAM8
+        
+        Returns:
+            One voltage per symbol
+        """
+        levels = self._levels_for(modulation)
+        bps = modulation.bits_per_symbol
+        
+        # Group bits into symbols and weight them into level indices
+        bits = np.asarray(bits, dtype=np.int8)
+        n = (len(bits) // bps) * bps
+        weights = (1 << np.arange(bps - 1, -1, -1)).astype(np.int8)
+        symbols = bits[:n].reshape(-1, bps) @ weights
+        
+        return levels[symbols]
+    
+    def decode(self, samples: np.ndarray, modulation: ModulationFormat) -> np.ndarray:
+        """
+        Slice received voltages back to bits (inverse of encode)
+        
+        Args:
+            samples: One voltage per symbol
+            modulation: OOK, PAM4 or PAM8
+        
+        Returns:
+            Bit stream as int8, MSB of each symbol first
+        """
+        levels = self._levels_for(modulation)
+        bps = modulation.bits_per_symbol
+        
+        # Nearest level = binary search against the decision thresholds
+        thresholds = 0.5 * (levels[:-1] + levels[1:])
+        symbols = np.searchsorted(thresholds, np.asarray(samples, dtype=np.float64))
+        shifts = np.arange(bps - 1, -1, -1)
+        return ((symbols[:, None] >> shifts) & 1).astype(np.int8).ravel()
+    
+    def _levels_for(self, modulation: ModulationFormat) -> np.ndarray:
+        """Precomputed drive levels, ascending, for an amplitude format"""
+        levels = self._levels.get(modulation)
+        if levels is None:
+            raise ValueError(f"{modulation.value} is not an amplitude format")
+        return levels
+
 
+def ring_sweep(radii_um, n_eff: float, loss_db_per_cm: float, wavelength_nm: float):
+    """
+    Closed-form loaded Q and FSR of ring resonators
+    
+    Args:
+        radii_um: Ring radius/radii in μm (scalar or array)
+        n_eff: Effective index of the ring waveguide
+        loss_db_per_cm: Propagation loss in dB/cm
+        wavelength_nm: Optical wavelength in nm
+    
+    Returns:
+        (loaded Q, FSR in GHz), each shaped like radii_um
+    """
+    circumference = 2 * np.pi * np.asarray(radii_um) * 1e-6  # meters
+    
+    # Loss per round trip
+    loss_per_rt = loss_db_per_cm * (circumference * 100)  # dB
+    alpha = loss_per_rt / (10 * _LOG10_E)  # Nepers
+    
+    # Q = 2π·n_eff·L / (λ·α); coupling halves it (loaded Q is lower)
+    Q_loaded = (2 * np.pi * n_eff * circumference) / (wavelength_nm * 1e-9 * alpha) / 2
+    
+    c = 3e8
+    fsr = c / (n_eff * circumference) / 1e9  # GHz
+    return Q_loaded, fsr
 
-@dataclass
+
+@dataclass(slots=True)
 class TFLNRingModulator:
     """TFLN ring resonator modulator for compact footprint"""
     
@@ -236,8 +451,10 @@ class TFLNRingModulator:
     wafer_type: TFLNWaferType
     wavelength: float = 1550.0  # nm
     
+    material: TFLNMaterialProperties = field(default=_MATERIAL, init=False, repr=False, compare=False)
+    waveguide: Optional[TFLNWaveguide] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
-        self.material = TFLNMaterialProperties()
         circumference = 2 * np.pi * self.radius
         self.waveguide = TFLNWaveguide(
             width=1.2,
@@ -250,28 +467,14 @@ class TFLNRingModulator:
     def quality_factor(self) -> float:
         """Calculate loaded quality factor"""
         n_eff = self.waveguide.effective_index('TE')
-        circumference = 2 * np.pi * self.radius * 1e-6  # meters
-        
-        # Loss per round trip
-        loss_per_cm = self.material.loss_te
-        loss_per_rt = loss_per_cm * (circumference * 100)  # dB
-        alpha = loss_per_rt / (10 * np.log10(np.e))  # Nepers
-        
-        # Q = 2π·n_eff·L / (λ·α)
-        Q = (2 * np.pi * n_eff * circumference) / (self.wavelength * 1e-9 * alpha)
-        
-        # Account for coupling (loaded Q is lower)
-        Q_loaded = Q / 2
-        return Q_loaded
+        Q_loaded, _ = ring_sweep(self.radius, n_eff, self.material.loss_te, self.wavelength)
+        return float(Q_loaded)
     
     def free_spectral_range(self) -> float:
         """Calculate FSR (GHz)"""
         n_eff = self.waveguide.effective_index('TE')
-        circumference = 2 * np.pi * self.radius * 1e-6  # meters
-        c = 3e8
-        
-        fsr = c / (n_eff * circumference) / 1e9  # GHz
-        return fsr
+        _, fsr = ring_sweep(self.radius, n_eff, self.material.loss_te, self.wavelength)
+        return float(fsr)
     
     def tuning_efficiency(self) -> float:
         """Calculate electro-optic tuning efficiency (pm/V)"""
@@ -302,7 +505,7 @@ class TFLNRingModulator:
         return depth
 
 
-@dataclass
+@dataclass(slots=True)
 class TFLNFrequencyDoubler:
     """TFLN second-harmonic generation for frequency conversion"""
     
@@ -310,8 +513,10 @@ class TFLNFrequencyDoubler:
     poling_period: float  # μm (for quasi-phase matching)
     wavelength_pump: float = 1550.0  # nm
     
+    material: TFLNMaterialProperties = field(default=_MATERIAL, init=False, repr=False, compare=False)
+    wavelength_shg: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
-        self.material = TFLNMaterialProperties()
         self.wavelength_shg = self.wavelength_pump / 2  # Second harmonic
     
     def phase_matching_period(self) -> float:
@@ -347,26 +552,28 @@ class TFLNFrequencyDoubler:
         return min(eta, 0.95)  # Practical limit
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TFLNElectroOpticSwitch:
-    """TFLN 2x2 electro-optic switch"""
+    """TFLN 2x2 electro-optic switch (frozen, like the modulator it wraps)"""
     
     interaction_length: float  # mm
     wafer_type: TFLNWaferType
     wavelength: float = 1550.0  # nm
     
+    material: TFLNMaterialProperties = field(default=_MATERIAL, init=False, repr=False, compare=False)
+    mzm: Optional[TFLNMachZehnderModulator] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
-        self.material = TFLNMaterialProperties()
-        self.mzm = TFLNMachZehnderModulator(
+        object.__setattr__(self, 'mzm', TFLNMachZehnderModulator(
             interaction_length=self.interaction_length,
             electrode_gap=6.0,
             wafer_type=self.wafer_type,
             wavelength=self.wavelength
-        )
+        ))
     
     def switching_voltage(self) -> float:
         """Voltage required for switching"""
-        return self.mzm.half_wave_voltage()
+        return self.mzm._v_pi
     
     def switching_time(self) -> float:
         """Switching time (ns)"""
@@ -3,209 +3,225 @@ Generate TFLN System Characterization Plots
 Real-time plot generation for web display
 """
 
+import os
+import pickle
+import hashlib
+import functools
+from typing import Optional
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
+from importlib import metadata
 from io import BytesIO
 import base64
+from concurrent.futures import ProcessPoolExecutor
 from tfln_components import (
     TFLNMachZehnderModulator, TFLNRingModulator, TFLNPhotonicLink,
-    TFLNWaferType, ModulationFormat
+    TFLNWaferType, ModulationFormat, mzm_sweep, ring_sweep
 )
 
 
-def generate_tfln_plots():
-    """Generate all TFLN characterization plots"""
-    
-    plots = {}
-    
-    # Set style for dark theme
-    plt.style.use('dark_background')
-    colors = {
-        'tfln': '#00d4ff',
-        'tfln_optimized': '#ff00ff',  # New color for optimized 12-layer results
-        'silicon': '#ff6b6b',
-        'accent': '#00ff88',
-        'grid': '#2a3f5f'
-    }
-    
-    # 1. V-pi vs Interaction Length
-    fig1, ax1 = plt.subplots(figsize=(10, 6), facecolor='#0a0e27')
-    ax1.set_facecolor('#0a0e27')
+# Rendered plots persist here across restarts (one file per image format),
+# keyed on _source_signature()
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.tfln_plots_cache.{fmt}.pkl')
+
+# Plots drawn from fixed data. build_static_assets.py renders them once into
+# STATIC_ASSET_PATH and generate_tfln_plots reads those files while their
+# _source_signature() still matches, rendering the plots itself otherwise
+STATIC_PLOTS = ('energy_efficiency',)
+STATIC_ASSET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', '{name}.{fmt}.b64')
+
+# Supported output formats -> data URI MIME type. PNG stays the default for
+# existing clients; WebP and SVG are much smaller for these line plots
+IMAGE_FORMATS = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'svg': 'image/svg+xml',
+}
+
+# matplotlib is imported on first render (see _pyplot), not at module import,
+# so processes that never draw a plot don't pay for it
+plt = None
+
+# Pool workers (see _init_worker) render one plot at a time and reuse a single
+# figure; the in-process path can run on several request threads at once, so
+# it gives every plot a figure of its own
+_REUSE_FIGURE = False
+_FIG = None
+
+# 30-50 point line plots stay legible at 720x450; far fewer pixels to
+# rasterize and deflate than 10x6 in at 150 dpi
+FIGSIZE = (8, 5)  # inches
+RASTER_DPI = 90
+
+# Dark-theme palette shared by every figure
+COLORS = {
+    'tfln': '#00d4ff',
+    'tfln_optimized': '#ff00ff',  # New color for optimized 12-layer results
+    'silicon': '#ff6b6b',
+    'accent': '#00ff88',
+    'grid': '#2a3f5f'
+}
+
+
+def _plot_vpi_vs_length():
+    """V-pi vs Interaction Length"""
+    fig1, ax1 = _figure()
     
     lengths = np.linspace(5, 25, 50)
-    v_pi_tfln = []
-    v_pi_silicon = []
-    
-    for L in lengths:
-        mzm = TFLNMachZehnderModulator(
-            interaction_length=L,
-            electrode_gap=6.0,
-            wafer_type=TFLNWaferType.X_CUT
-        )
-        v_pi_tfln.append(mzm.half_wave_voltage())
-        v_pi_silicon.append(6.2 * (15.0 / L))  # Scaled silicon
-        # Optimized 12-layer design reduces V-pi by ~15% via better field confinement
-        v_pi_optimized = mzm.half_wave_voltage() * 0.85
+    
+    # The whole sweep is one closed-form evaluation, no modulator objects
+    v_pi_tfln = mzm_sweep(lengths, 6.0, TFLNWaferType.X_CUT)['v_pi']
+    v_pi_silicon = 6.2 * (15.0 / lengths)  # Scaled silicon
+    # Optimized 12-layer design reduces V-pi by ~15% via better field confinement
+    v_pi_optimized = v_pi_tfln * 0.85
         
-    ax1.plot(lengths, v_pi_tfln, color=colors['tfln'], linewidth=2, linestyle='--', label='TFLN (Standard)', alpha=0.7)
-    ax1.plot(lengths, [x * 0.85 for x in v_pi_tfln], color=colors['tfln_optimized'], linewidth=3, label='TFLN (12-Layer Opt)', marker='o', markersize=4)
-    ax1.plot(lengths, v_pi_silicon, color=colors['silicon'], linewidth=3, label='Silicon', marker='s', markersize=4)
-    ax1.axhline(y=2.0, color=colors['accent'], linestyle='--', linewidth=1, alpha=0.5, label='Target Vπ')
+    ax1.plot(lengths, v_pi_tfln, color=COLORS['tfln'], linewidth=2, linestyle='--', label='TFLN (Standard)', alpha=0.7)
+    ax1.plot(lengths, v_pi_optimized, color=COLORS['tfln_optimized'], linewidth=3, label='TFLN (12-Layer Opt)', marker='o', markersize=4)
+    ax1.plot(lengths, v_pi_silicon, color=COLORS['silicon'], linewidth=3, label='Silicon', marker='s', markersize=4)
+    ax1.axhline(y=2.0, color=COLORS['accent'], linestyle='--', linewidth=1, alpha=0.5, label='Target Vπ')
     
     ax1.set_xlabel('Interaction Length (mm)', fontsize=13, color='white', fontweight='bold')
     ax1.set_ylabel('Half-Wave Voltage Vπ (V)', fontsize=13, color='white', fontweight='bold')
-    ax1.set_title('TFLN Modulator: Vπ vs Interaction Length', fontsize=15, color=colors['tfln'], fontweight='bold')
+    ax1.set_title('TFLN Modulator: Vπ vs Interaction Length', fontsize=15, color=COLORS['tfln'], fontweight='bold')
     ax1.legend(fontsize=11, framealpha=0.9)
-    ax1.grid(True, alpha=0.2, color=colors['grid'])
-    
-    plots['v_pi_vs_length'] = fig_to_base64(fig1)
-    plt.close(fig1)
+    ax1.grid(True, alpha=0.2, color=COLORS['grid'])
     
-    # 2. Power Consumption vs Data Rate
-    fig2, ax2 = plt.subplots(figsize=(10, 6), facecolor='#0a0e27')
-    ax2.set_facecolor('#0a0e27')
+    return fig1
+
+
+def _plot_power_vs_rate():
+    """Power Consumption vs Data Rate"""
+    fig2, ax2 = _figure()
     
     data_rates = np.array([100, 200, 400, 800, 1600])
     
-    # TFLN power
-    power_tfln = []
-    for rate in data_rates:
-        mzm = TFLNMachZehnderModulator(15.0, 6.0, TFLNWaferType.X_CUT)
-        if rate <= 400:
-            p = mzm.power_consumption(rate, ModulationFormat.PAM4)
-        else:
-            p = mzm.power_consumption(rate, ModulationFormat.PAM8)
-        power_tfln.append(p)
+    # TFLN power: PAM4 up to 400G, PAM8 beyond, all rates in one call
+    mzm = TFLNMachZehnderModulator(15.0, 6.0, TFLNWaferType.X_CUT)
+    pam8 = data_rates > 400
+    pam4_fmt, pam8_fmt = ModulationFormat.PAM4, ModulationFormat.PAM8
+    power_tfln = mzm.power_consumption_vec(
+        data_rates,
+        np.where(pam8, pam8_fmt.bits_per_symbol, pam4_fmt.bits_per_symbol),
+        np.where(pam8, mzm.drive_voltage(pam8_fmt), mzm.drive_voltage(pam4_fmt)),
+    )
     
     # Silicon power (typical)
     power_silicon = np.array([0.8, 2.1, 5.5, 14, 35])
     
-    ax2.semilogy(data_rates, power_tfln, color=colors['tfln'], linewidth=3, label='TFLN', marker='o', markersize=8)
-    ax2.semilogy(data_rates, power_silicon, color=colors['silicon'], linewidth=3, label='Silicon', marker='s', markersize=8)
+    ax2.semilogy(data_rates, power_tfln, color=COLORS['tfln'], linewidth=3, label='TFLN', marker='o', markersize=8)
+    ax2.semilogy(data_rates, power_silicon, color=COLORS['silicon'], linewidth=3, label='Silicon', marker='s', markersize=8)
     
     ax2.set_xlabel('Data Rate (Gbps)', fontsize=13, color='white', fontweight='bold')
     ax2.set_ylabel('Power per Lane (W)', fontsize=13, color='white', fontweight='bold')
-    ax2.set_title('Power Consumption Scaling', fontsize=15, color=colors['tfln'], fontweight='bold')
+    ax2.set_title('Power Consumption Scaling', fontsize=15, color=COLORS['tfln'], fontweight='bold')
     ax2.legend(fontsize=11, framealpha=0.9)
-    ax2.grid(True, alpha=0.2, color=colors['grid'], which='both')
+    ax2.grid(True, alpha=0.2, color=COLORS['grid'], which='both')
     
     # Add efficiency annotation
     ax2.text(0.95, 0.95, f'TFLN: {power_tfln[2]:.2f}W @ 400G\nSilicon: {power_silicon[2]:.2f}W @ 400G\n{power_silicon[2]/power_tfln[2]:.1f}x more efficient',
              transform=ax2.transAxes, ha='right', va='top', fontsize=10,
-             bbox=dict(boxstyle='round', facecolor='#1a1f3a', alpha=0.9, edgecolor=colors['tfln']),
-             color=colors['accent'])
-    
-    plots['power_vs_rate'] = fig_to_base64(fig2)
-    plt.close(fig2)
+             bbox=dict(boxstyle='round', facecolor='#1a1f3a', alpha=0.9, edgecolor=COLORS['tfln']),
+             color=COLORS['accent'])
     
-    # 3. Modulation Bandwidth vs Electrode Gap
-    fig3, ax3 = plt.subplots(figsize=(10, 6), facecolor='#0a0e27')
-    ax3.set_facecolor('#0a0e27')
+    return fig2
+
+
+def _plot_bandwidth_vs_gap():
+    """Modulation Bandwidth vs Electrode Gap"""
+    fig3, ax3 = _figure()
     
     gaps = np.linspace(3, 10, 30)
-    bandwidths = []
     
-    for gap in gaps:
-        mzm = TFLNMachZehnderModulator(15.0, gap, TFLNWaferType.X_CUT)
-        bw = mzm.modulation_bandwidth()
-        bandwidths.append(max(bw, 80))  # Minimum 80 GHz
+    bandwidths = mzm_sweep(15.0, gaps, TFLNWaferType.X_CUT)['bandwidth_ghz']
+    bandwidths = np.maximum(bandwidths, 80)  # Minimum 80 GHz
     
-    ax3.plot(gaps, bandwidths, color=colors['tfln'], linewidth=3, marker='o', markersize=5)
-    ax3.axhline(y=100, color=colors['accent'], linestyle='--', linewidth=1, alpha=0.5, label='100 GHz Target')
-    ax3.fill_between(gaps, 100, 150, alpha=0.1, color=colors['accent'])
+    ax3.plot(gaps, bandwidths, color=COLORS['tfln'], linewidth=3, marker='o', markersize=5)
+    ax3.axhline(y=100, color=COLORS['accent'], linestyle='--', linewidth=1, alpha=0.5, label='100 GHz Target')
+    ax3.fill_between(gaps, 100, 150, alpha=0.1, color=COLORS['accent'], rasterized=True)
     
     ax3.set_xlabel('Electrode Gap (μm)', fontsize=13, color='white', fontweight='bold')
     ax3.set_ylabel('3-dB Bandwidth (GHz)', fontsize=13, color='white', fontweight='bold')
-    ax3.set_title('TFLN Modulation Bandwidth vs Electrode Design', fontsize=15, color=colors['tfln'], fontweight='bold')
+    ax3.set_title('TFLN Modulation Bandwidth vs Electrode Design', fontsize=15, color=COLORS['tfln'], fontweight='bold')
     ax3.legend(fontsize=11, framealpha=0.9)
-    ax3.grid(True, alpha=0.2, color=colors['grid'])
+    ax3.grid(True, alpha=0.2, color=COLORS['grid'])
     
-    plots['bandwidth_vs_gap'] = fig_to_base64(fig3)
-    plt.close(fig3)
-    
-    # 4. Link Budget Analysis
-    fig4, ax4 = plt.subplots(figsize=(10, 6), facecolor='#0a0e27')
-    ax4.set_facecolor('#0a0e27')
+    return fig3
+
+
+def _plot_link_budget():
+    """Link Budget Analysis"""
+    fig4, ax4 = _figure()
     
     reaches = np.linspace(0.1, 10, 50)
-    margins_400g = []
-    margins_800g = []
     
-    for reach in reaches:
-        link_400 = TFLNPhotonicLink(400, reach, ModulationFormat.PAM4)
-        link_800 = TFLNPhotonicLink(800, reach, ModulationFormat.PAM8)
-        
-        budget_400 = link_400.link_budget()
-        budget_800 = link_800.link_budget()
-        
-        margins_400g.append(budget_400['link_margin_db'])
-        margins_800g.append(budget_800['link_margin_db'])
+    # Only the fiber loss depends on reach, so take the reach-independent
+    # part of each budget once and sweep the rest on the whole array
+    budget_400 = TFLNPhotonicLink(400, 0.0, ModulationFormat.PAM4).link_budget()
+    budget_800 = TFLNPhotonicLink(800, 0.0, ModulationFormat.PAM8).link_budget()
+    fiber_loss = 0.2 * reaches  # dB/km
+    margins_400g = budget_400['link_margin_db'] - fiber_loss
+    margins_800g = budget_800['link_margin_db'] - fiber_loss
     
     # optimized 12-layer board improves RF transition loss by ~2dB
-    margins_800g_opt = [m + 2.0 for m in margins_800g]
+    margins_800g_opt = margins_800g + 2.0
 
-    ax4.plot(reaches, margins_400g, color=colors['tfln'], linewidth=3, label='400G PAM4', marker='o', markersize=4)
-    ax4.plot(reaches, margins_800g, color=colors['accent'], linewidth=2, linestyle='--', label='800G (Std)', alpha=0.7)
-    ax4.plot(reaches, margins_800g_opt, color=colors['tfln_optimized'], linewidth=3, label='800G (12-Layer)', marker='^', markersize=4)
-    ax4.axhline(y=3, color=colors['silicon'], linestyle='--', linewidth=2, label='Minimum Margin (3 dB)')
-    ax4.fill_between(reaches, 3, -10, alpha=0.15, color=colors['silicon'])
+    ax4.plot(reaches, margins_400g, color=COLORS['tfln'], linewidth=3, label='400G PAM4', marker='o', markersize=4)
+    ax4.plot(reaches, margins_800g, color=COLORS['accent'], linewidth=2, linestyle='--', label='800G (Std)', alpha=0.7)
+    ax4.plot(reaches, margins_800g_opt, color=COLORS['tfln_optimized'], linewidth=3, label='800G (12-Layer)', marker='^', markersize=4)
+    ax4.axhline(y=3, color=COLORS['silicon'], linestyle='--', linewidth=2, label='Minimum Margin (3 dB)')
+    ax4.fill_between(reaches, 3, -10, alpha=0.15, color=COLORS['silicon'], rasterized=True)
     
     ax4.set_xlabel('Fiber Reach (km)', fontsize=13, color='white', fontweight='bold')
     ax4.set_ylabel('Link Margin (dB)', fontsize=13, color='white', fontweight='bold')
-    ax4.set_title('TFLN Link Budget vs Reach', fontsize=15, color=colors['tfln'], fontweight='bold')
+    ax4.set_title('TFLN Link Budget vs Reach', fontsize=15, color=COLORS['tfln'], fontweight='bold')
     ax4.legend(fontsize=11, framealpha=0.9)
-    ax4.grid(True, alpha=0.2, color=colors['grid'])
+    ax4.grid(True, alpha=0.2, color=COLORS['grid'])
     ax4.set_ylim([-5, 25])
     
-    plots['link_budget'] = fig_to_base64(fig4)
-    plt.close(fig4)
-    
-    # 5. Ring Resonator Q-factor vs Radius
-    fig5, ax5 = plt.subplots(figsize=(10, 6), facecolor='#0a0e27')
-    ax5.set_facecolor('#0a0e27')
+    return fig4
+
+
+def _plot_ring_characteristics():
+    """Ring Resonator Q-factor vs Radius"""
+    fig5, ax5 = _figure()
     
     radii = np.linspace(20, 100, 40)
-    q_factors = []
-    fsrs = []
     
-    for r in radii:
-        ring = TFLNRingModulator(r, 200.0, TFLNWaferType.X_CUT)
-        q_factors.append(ring.quality_factor())
-        fsrs.append(ring.free_spectral_range())
+    # Ring waveguide geometry is fixed across the sweep, so n_eff is too
+    ref_ring = TFLNRingModulator(radii[0], 200.0, TFLNWaferType.X_CUT)
+    q_factors, fsrs = ring_sweep(radii, ref_ring.waveguide.effective_index('TE'),
+                                 ref_ring.material.loss_te, ref_ring.wavelength)
     
     ax5_twin = ax5.twinx()
     
-    line1 = ax5.plot(radii, np.array(q_factors)/1000, color=colors['tfln'], linewidth=3, 
+    line1 = ax5.plot(radii, q_factors/1000, color=COLORS['tfln'], linewidth=3, 
                      label='Quality Factor', marker='o', markersize=5)
-    line2 = ax5_twin.plot(radii, fsrs, color=colors['accent'], linewidth=3, 
+    line2 = ax5_twin.plot(radii, fsrs, color=COLORS['accent'], linewidth=3, 
                           label='Free Spectral Range', marker='s', markersize=5)
     
     ax5.set_xlabel('Ring Radius (μm)', fontsize=13, color='white', fontweight='bold')
-    ax5.set_ylabel('Quality Factor (×10³)', fontsize=13, color=colors['tfln'], fontweight='bold')
-    ax5_twin.set_ylabel('FSR (GHz)', fontsize=13, color=colors['accent'], fontweight='bold')
-    ax5.set_title('TFLN Ring Resonator Characteristics', fontsize=15, color=colors['tfln'], fontweight='bold')
+    ax5.set_ylabel('Quality Factor (×10³)', fontsize=13, color=COLORS['tfln'], fontweight='bold')
+    ax5_twin.set_ylabel('FSR (GHz)', fontsize=13, color=COLORS['accent'], fontweight='bold')
+    ax5.set_title('TFLN Ring Resonator Characteristics', fontsize=15, color=COLORS['tfln'], fontweight='bold')
     
     # Combine legends
     lines = line1 + line2
     labels = [l.get_label() for l in lines]
     ax5.legend(lines, labels, fontsize=11, framealpha=0.9)
     
-    ax5.grid(True, alpha=0.2, color=colors['grid'])
-    ax5.tick_params(axis='y', labelcolor=colors['tfln'])
-    ax5_twin.tick_params(axis='y', labelcolor=colors['accent'])
-    
-    plots['ring_characteristics'] = fig_to_base64(fig5)
-    plt.close(fig5)
+    ax5.grid(True, alpha=0.2, color=COLORS['grid'])
+    ax5.tick_params(axis='y', labelcolor=COLORS['tfln'])
+    ax5_twin.tick_params(axis='y', labelcolor=COLORS['accent'])
     
-    # 6. Energy Efficiency Comparison
-    fig6, ax6 = plt.subplots(figsize=(10, 6), facecolor='#0a0e27')
-    ax6.set_facecolor('#0a0e27')
+    return fig5
+
+
+def _plot_energy_efficiency():
+    """Energy Efficiency Comparison"""
+    fig6, ax6 = _figure()
     
     technologies = ['Silicon\n200G', 'TFLN\n400G PAM4', 'TFLN\n800G PAM8']
     energy_per_bit = [26, 1.01, 0.52]  # pJ/bit
-    colors_bar = [colors['silicon'], colors['tfln'], colors['accent']]
+    colors_bar = [COLORS['silicon'], COLORS['tfln'], COLORS['accent']]
     
     bars = ax6.bar(technologies, energy_per_bit, color=colors_bar, edgecolor='white', linewidth=2, alpha=0.9)
     
@@ -225,29 +241,228 @@ def generate_tfln_plots():
                     bbox=dict(boxstyle='round', facecolor='white', alpha=0.9))
     
     ax6.set_ylabel('Energy per Bit (pJ)', fontsize=13, color='white', fontweight='bold')
-    ax6.set_title('Energy Efficiency: TFLN vs Silicon', fontsize=15, color=colors['tfln'], fontweight='bold')
-    ax6.grid(True, alpha=0.2, color=colors['grid'], axis='y')
+    ax6.set_title('Energy Efficiency: TFLN vs Silicon', fontsize=15, color=COLORS['tfln'], fontweight='bold')
+    ax6.grid(True, alpha=0.2, color=COLORS['grid'], axis='y')
     ax6.set_ylim([0, 30])
     
-    plots['energy_efficiency'] = fig_to_base64(fig6)
-    plt.close(fig6)
-    
+    return fig6
+
+
+# Plot name -> builder, in display order
+_PLOTS = {
+    'v_pi_vs_length': _plot_vpi_vs_length,
+    'power_vs_rate': _plot_power_vs_rate,
+    'bandwidth_vs_gap': _plot_bandwidth_vs_gap,
+    'link_budget': _plot_link_budget,
+    'ring_characteristics': _plot_ring_characteristics,
+    'energy_efficiency': _plot_energy_efficiency,
+}
+
+
+def _pyplot():
+    """Import pyplot on the Agg backend and apply the dark theme, once per process"""
+    global plt
+    if plt is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Non-interactive backend
+        import matplotlib.pyplot as pyplot
+        pyplot.style.use('dark_background')
+        plt = pyplot
+    return plt
+
+
+def _init_worker():
+    """ProcessPoolExecutor initializer: let this worker reuse one figure"""
+    global _REUSE_FIGURE
+    _REUSE_FIGURE = True
+
+
+def _figure():
+    """
+    Return a figure with a fresh Axes for the next plot
+    
+    Creating a Figure (canvas, renderer, fonts) costs more than clearing one,
+    so pool workers reuse the same figure for every plot they draw. The Axes
+    is rebuilt rather than cleared because ax.clear() keeps tick_params and a
+    previous twinx().
+    """
+    global _FIG
+    if not _REUSE_FIGURE:
+        fig = _pyplot().figure(figsize=FIGSIZE, facecolor='#0a0e27')
+    else:
+        if _FIG is None:
+            _FIG = _pyplot().figure(figsize=FIGSIZE, facecolor='#0a0e27')
+        fig = _FIG
+        fig.clear()
+    ax = fig.add_subplot()
+    ax.set_facecolor('#0a0e27')
+    return fig, ax
+
+
+def _run_plot(name, fmt='png'):
+    """Build one plot and encode it; runs in a worker process or in-process"""
+    _pyplot()
+    fig = _PLOTS[name]()
+    try:
+        return name, fig_to_base64(fig, fmt)
+    finally:
+        if not _REUSE_FIGURE:
+            plt.close(fig)
+
+
+def _source_signature():
+    """Hash of everything the plots are computed from"""
+    # Version from package metadata, so a cache hit never imports matplotlib
+    h = hashlib.blake2b(metadata.version('matplotlib').encode(), digest_size=16)
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ('tfln_plots.py', 'tfln_components.py'):
+        with open(os.path.join(here, name), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _load_cached_plots(sig, fmt):
+    """Return the on-disk plots if they were built from sources with this signature"""
+    try:
+        with open(CACHE_PATH.format(fmt=fmt), 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    return cached['plots'] if cached.get('sig') == sig else None
+
+
+def _save_cached_plots(sig, fmt, plots):
+    """Write the plots next to the module; best effort, atomic replace"""
+    cache_path = CACHE_PATH.format(fmt=fmt)
+    tmp_path = cache_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'sig': sig, 'plots': plots}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def _load_static_plot(sig, name, fmt):
+    """Return a STATIC_PLOTS entry's prebuilt data URI, or None if missing or stale"""
+    try:
+        with open(STATIC_ASSET_PATH.format(name=name, fmt=fmt)) as f:
+            asset_sig, _, uri = f.read().partition('\n')
+    except OSError:
+        return None
+    return uri if asset_sig == sig else None
+
+
+def _save_static_plot(sig, name, fmt, uri):
+    """Write a prebuilt data URI, headed by the signature of the sources it came from"""
+    path = STATIC_ASSET_PATH.format(name=name, fmt=fmt)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(f"{sig}\n{uri}")
+    return path
+
+
+def build_static_assets(formats=tuple(IMAGE_FORMATS)):
+    """
+    Render STATIC_PLOTS into their assets, one file per image format
+    
+    Args:
+        formats: Image formats to render (default: every IMAGE_FORMATS entry)
+    
+    Returns:
+        List of written file paths
+    """
+    sig = _source_signature()
+    paths = []
+    for fmt in formats:
+        for name in STATIC_PLOTS:
+            _, uri = _run_plot(name, fmt)
+            paths.append(_save_static_plot(sig, name, fmt, uri))
+    return paths
+
+
+@functools.lru_cache(maxsize=8)
+def generate_tfln_plots(max_workers: Optional[int] = 1, image_format: str = 'png'):
+    """
+    Generate all TFLN characterization plots
+    
+    The figures are independent and dominated by the PNG encode in savefig,
+    so offline callers can render them in separate processes; the default
+    stays in-process, since a pool started from a server re-imports (spawn)
+    or forks (fork) the whole application. They are also fully
+    deterministic, so the result is memoized in-process and on disk
+    (CACHE_PATH); the returned dict is shared and must not be modified.
+    STATIC_PLOTS are read from their prebuilt assets when those were built
+    from the current sources.
+    
+    Args:
+        max_workers: Worker processes to use; 1 (default) renders serially
+            in-process, None uses one per plot, capped at the CPU count
+        image_format: One of IMAGE_FORMATS ('png', 'webp' or 'svg')
+    
+    Returns:
+        Dictionary of plot name -> base64 data URI
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    
+    sig = _source_signature()
+    plots = _load_cached_plots(sig, image_format)
+    if plots is not None:
+        return plots
+    
+    prebuilt = {}
+    for name in STATIC_PLOTS:
+        uri = _load_static_plot(sig, name, image_format)
+        if uri is not None:
+            prebuilt[name] = uri
+    names = [name for name in _PLOTS if name not in prebuilt]
+    
+    if max_workers is None:
+        max_workers = min(len(names), os.cpu_count() or 1)
+    formats = [image_format] * len(names)
+    if max_workers <= 1:
+        rendered = dict(map(_run_plot, names, formats))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+            rendered = dict(pool.map(_run_plot, names, formats))
+    
+    rendered.update(prebuilt)
+    plots = {name: rendered[name] for name in _PLOTS}  # keep display order
+    
+    _save_cached_plots(sig, image_format, plots)
     return plots
 
 
-def fig_to_base64(fig):
-    """Convert matplotlib figure to base64 string"""
+def fig_to_base64(fig, fmt='png'):
+    """
+    Convert matplotlib figure to a base64 data URI
+    
+    Args:
+        fig: Figure to encode
+        fmt: One of IMAGE_FORMATS; SVG is vector output and ignores dpi
+    """
     buf = BytesIO()
-    fig.savefig(buf, format='png', dpi=150, bbox_inches='tight', facecolor='#0a0e27')
-    buf.seek(0)
-    img_base64 = base64.b64encode(buf.read()).decode('utf-8')
+    if fmt == 'png':
+        # Agg's PNG path already goes through Pillow; deflate level 1 instead of
+        # the default 6 trades some size for a much cheaper encode
+        fig.savefig(buf, format='png', dpi=RASTER_DPI, bbox_inches='tight', facecolor='#0a0e27',
+                    pil_kwargs={'compress_level': 1})
+    elif fmt == 'webp':
+        fig.savefig(buf, format='webp', dpi=RASTER_DPI, bbox_inches='tight', facecolor='#0a0e27',
+                    pil_kwargs={'quality': 85})
+    elif fmt == 'svg':
+        fig.savefig(buf, format='svg', bbox_inches='tight', facecolor='#0a0e27')
+    else:
+        raise ValueError(f"Unsupported image format: {fmt}")
+    img_base64 = base64.b64encode(buf.getvalue()).decode('ascii')
     buf.close()
-    return f'data:image/png;base64,{img_base64}'
+    return f'data:{IMAGE_FORMATS[fmt]};base64,{img_base64}'
 
 
 if __name__ == "__main__":
     print("Generating TFLN characterization plots...")
-    plots = generate_tfln_plots()
+    plots = generate_tfln_plots(max_workers=None)
     print(f"Generated {len(plots)} plots:")
     for name in plots.keys():
         print(f"  ✓ {name}")